@@ -1,46 +1,103 @@
+from datetime import timedelta
+
 from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import connections
 from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .models import Draw, IngestionLog, RecommendationSnapshot, AiPredictionSnapshot
+from .services.tasks import enqueue_ingest
+
+
+class EstimatedCountPaginator(Paginator):
+    # Below this many rows an exact COUNT(*) is cheap and more accurate.
+    exact_threshold = 10000
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is not None and not query.where:
+            connection = connections[queryset.db]
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT reltuples::BIGINT FROM pg_class WHERE relname = %s',
+                        [queryset.model._meta.db_table],
+                    )
+                    row = cursor.fetchone()
+                if row and row[0] > self.exact_threshold:
+                    return int(row[0])
+        return super().count
+
+
+class ModelAdminEstimateCountMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
 
-from .models import Draw, DrawNumber, IngestionLog, RecommendationSnapshot, AiPredictionSnapshot
-from .services.ingestion import ingest_draws
+class DateRangeFilter(admin.SimpleListFilter):
+    title = 'date'
+    parameter_name = 'date_range'
+    field_name = 'date'
+    ranges = {
+        '30d': ('Last 30 days', 30),
+        '1y': ('Last year', 365),
+        '5y': ('Last 5 years', 365 * 5),
+    }
+
+    def lookups(self, request, model_admin):
+        return [(key, label) for key, (label, _) in self.ranges.items()]
+
+    def queryset(self, request, queryset):
+        selected = self.ranges.get(self.value())
+        if selected is None:
+            return queryset
+        return queryset.filter(**{f'{self.field_name}__gte': self.cutoff(selected[1])})
+
+    def cutoff(self, days: int):
+        return timezone.localdate() - timedelta(days=days)
+
+
+class RunAtRangeFilter(DateRangeFilter):
+    title = 'run at'
+    parameter_name = 'run_at_range'
+    field_name = 'run_at'
+
+    def cutoff(self, days: int):
+        return timezone.now() - timedelta(days=days)
 
 
 @admin.register(Draw)
-class DrawAdmin(admin.ModelAdmin):
+class DrawAdmin(ModelAdminEstimateCountMixin, admin.ModelAdmin):
     list_display = ('game', 'date', 'bonus', 'source_url')
-    list_filter = ('game', 'date')
+    list_filter = ('game', DateRangeFilter)
     search_fields = ('date', 'game')
 
 
-@admin.register(DrawNumber)
-class DrawNumberAdmin(admin.ModelAdmin):
-    list_display = ('draw', 'number', 'is_bonus')
-    list_filter = ('is_bonus',)
-    search_fields = ('number',)
-
-
 @admin.register(IngestionLog)
-class IngestionLogAdmin(admin.ModelAdmin):
+class IngestionLogAdmin(ModelAdminEstimateCountMixin, admin.ModelAdmin):
     list_display = ('run_at', 'game', 'status', 'source', 'draws_processed', 'draws_added')
-    list_filter = ('game', 'status', 'source', 'run_at')
+    list_filter = ('game', 'status', 'source', RunAtRangeFilter)
     actions = ['trigger_ingest', 'trigger_incremental']
 
     def trigger_ingest(self, request, queryset):
-        result = ingest_draws()
+        log = enqueue_ingest()
         messages.add_message(
             request,
             messages.INFO,
-            f"Ingestion triggered at {timezone.now():%Y-%m-%d %H:%M}. Added {result['draws_added']} draws.",
+            f"Ingestion queued at {timezone.now():%Y-%m-%d %H:%M} (log #{log.pk}).",
         )
 
     trigger_ingest.short_description = 'Trigger ingest with default settings'
 
     def trigger_incremental(self, request, queryset):
-        result = ingest_draws(incremental=True)
+        log = enqueue_ingest(incremental=True)
         messages.add_message(
             request,
             messages.INFO,
-            f"Incremental ingestion at {timezone.now():%Y-%m-%d %H:%M}. Added {result['draws_added']} draws.",
+            f"Incremental ingestion queued at {timezone.now():%Y-%m-%d %H:%M} (log #{log.pk}).",
         )
 
     trigger_incremental.short_description = 'Trigger incremental ingest'
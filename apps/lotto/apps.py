@@ -5,3 +5,6 @@ class LottoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.lotto'
     verbose_name = 'Lotto Oracle'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('lotto', '0004_add_game_fields'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ingestionlog',
+            name='status',
+            field=models.CharField(
+                choices=[('pending', 'Pending'), ('success', 'Success'), ('partial', 'Partial'), ('failed', 'Failed')],
+                max_length=16,
+            ),
+        ),
+    ]
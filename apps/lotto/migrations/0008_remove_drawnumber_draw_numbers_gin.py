@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def create_numbers_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS draw_numbers_gin ON lotto_draw USING GIN (numbers jsonb_path_ops)'
+    )
+
+
+def drop_numbers_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS draw_numbers_gin')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('lotto', '0005_ingestionlog_pending_status'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='DrawNumber',
+        ),
+        migrations.RunPython(create_numbers_gin_index, drop_numbers_gin_index),
+    ]
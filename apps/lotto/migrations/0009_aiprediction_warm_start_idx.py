@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('lotto', '0008_remove_drawnumber_draw_numbers_gin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aipredictionsnapshot',
+            index=models.Index(
+                fields=['game', 'window', 'seed', '-base_draw_date', '-created_at'],
+                name='ai_snapshot_warm_start_idx',
+            ),
+        ),
+    ]
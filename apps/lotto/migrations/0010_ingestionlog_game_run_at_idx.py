@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('lotto', '0009_aiprediction_warm_start_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ingestionlog',
+            index=models.Index(fields=['game', '-run_at'], name='ingestlog_game_run_at_idx'),
+        ),
+    ]
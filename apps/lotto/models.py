@@ -9,8 +9,11 @@ def _game_choices() -> list[tuple[str, str]]:
     ]
 
 
+GAME_CHOICES = _game_choices()
+
+
 class Draw(models.Model):
-    game = models.CharField(max_length=8, db_index=True, choices=_game_choices(), default='max')
+    game = models.CharField(max_length=8, db_index=True, choices=GAME_CHOICES, default='max')
     date = models.DateField(db_index=True)
     numbers = models.JSONField()
     bonus = models.PositiveSmallIntegerField()
@@ -29,26 +32,9 @@ class Draw(models.Model):
         return f"{self.game} {self.date}: {' '.join(str(n) for n in self.numbers)} + {self.bonus}"
 
 
-class DrawNumber(models.Model):
-    draw = models.ForeignKey(Draw, on_delete=models.CASCADE, related_name='draw_numbers')
-    number = models.PositiveSmallIntegerField(db_index=True)
-    is_bonus = models.BooleanField(default=False)
-
-    class Meta:
-        constraints = [
-            models.UniqueConstraint(fields=['draw', 'number', 'is_bonus'], name='uniq_draw_number_bonus'),
-        ]
-        indexes = [
-            models.Index(fields=['number', 'is_bonus'], name='draw_number_idx'),
-        ]
-
-    def __str__(self) -> str:
-        label = 'bonus' if self.is_bonus else 'main'
-        return f"{self.draw.date} {label} {self.number}"
-
-
 class IngestionLog(models.Model):
     STATUS_CHOICES = [
+        ('pending', 'Pending'),
         ('success', 'Success'),
         ('partial', 'Partial'),
         ('failed', 'Failed'),
@@ -56,7 +42,7 @@ class IngestionLog(models.Model):
 
     run_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=16, choices=STATUS_CHOICES)
-    game = models.CharField(max_length=8, db_index=True, choices=_game_choices(), default='max')
+    game = models.CharField(max_length=8, db_index=True, choices=GAME_CHOICES, default='max')
     source = models.CharField(max_length=32)
     message = models.TextField(blank=True)
     draws_processed = models.PositiveIntegerField(default=0)
@@ -66,13 +52,16 @@ class IngestionLog(models.Model):
 
     class Meta:
         ordering = ['-run_at']
+        indexes = [
+            models.Index(fields=['game', '-run_at'], name='ingestlog_game_run_at_idx'),
+        ]
 
     def __str__(self) -> str:
         return f"{self.run_at:%Y-%m-%d %H:%M} {self.game} {self.status} {self.source}"
 
 
 class RecommendationSnapshot(models.Model):
-    game = models.CharField(max_length=8, db_index=True, choices=_game_choices(), default='max')
+    game = models.CharField(max_length=8, db_index=True, choices=GAME_CHOICES, default='max')
     base_draw_date = models.DateField(db_index=True)
     window = models.PositiveIntegerField(default=0)
     seed = models.CharField(max_length=64, blank=True)
@@ -95,7 +84,7 @@ class RecommendationSnapshot(models.Model):
 
 
 class AiPredictionSnapshot(models.Model):
-    game = models.CharField(max_length=8, db_index=True, choices=_game_choices(), default='max')
+    game = models.CharField(max_length=8, db_index=True, choices=GAME_CHOICES, default='max')
     base_draw_date = models.DateField(db_index=True)
     window = models.PositiveIntegerField(default=0)
     seed = models.CharField(max_length=64, blank=True)
@@ -110,6 +99,13 @@ class AiPredictionSnapshot(models.Model):
                 name='uniq_ai_snapshot_game_base_window_seed',
             ),
         ]
+        indexes = [
+            # Warm-start lookup: newest earlier snapshot for a game, window and seed.
+            models.Index(
+                fields=['game', 'window', 'seed', '-base_draw_date', '-created_at'],
+                name='ai_snapshot_warm_start_idx',
+            ),
+        ]
 
     def __str__(self) -> str:
         window_label = self.window if self.window else 'all'
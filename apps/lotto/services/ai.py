@@ -1,14 +1,24 @@
 from __future__ import annotations
 
-import math
-import random
-from typing import List, Dict, Any
+import base64
+from datetime import date
+import hashlib
+import io
+from typing import Iterable, List, Dict, Any
+
+import numpy as np
 
 from ..models import Draw
+from .cache import AnalysisCache, get_draws_version
+
+AI_CACHE_TTL = 60 * 60 * 24
+FINE_TUNE_EPOCHS = 2
+
+cache = AnalysisCache()
 
 
 def predict_next_draw_probabilities(
-    draws: List[Draw],
+    draws: Iterable[Draw],
     seed: str | None = None,
     max_samples: int = 400,
     hidden_size: int = 24,
@@ -16,8 +26,11 @@ def predict_next_draw_probabilities(
     learning_rate: float = 0.15,
     max_number: int = 50,
     main_count: int = 7,
+    warm_start: Dict[str, Any] | None = None,
+    batch_size: int = 1,
 ) -> Dict[str, Any]:
-    ordered = sorted(draws, key=lambda d: d.date)
+    # Callers pass draws oldest first (see get_draws(chronological=True)).
+    ordered = list(draws)
     if len(ordered) < 2:
         return {
             'probabilities': [{'number': i, 'probability': 0.0} for i in range(1, max_number + 1)],
@@ -31,25 +44,114 @@ def predict_next_draw_probabilities(
             },
         }
 
-    inputs, targets = _build_training_pairs(ordered, max_samples=max_samples, max_number=max_number)
-    rng = random.Random(seed or 42)
-    model = _train_mlp(
-        inputs,
-        targets,
-        hidden_size=hidden_size,
-        epochs=epochs,
-        learning_rate=learning_rate,
-        rng=rng,
-        max_number=max_number,
+    fingerprint = model_fingerprint(hidden_size, learning_rate, max_number)
+    model_state = (warm_start or {}).get('model') or {}
+    if model_state.get('fingerprint') != fingerprint or not model_state.get('weights'):
+        model_state = {}
+
+    params = {
+        'first': ordered[0].hash,
+        'last': ordered[-1].hash,
+        'draws': len(ordered),
+        'version': get_draws_version(ordered[-1].game),
+        'seed': seed,
+        'max_samples': max_samples,
+        'hidden_size': hidden_size,
+        'epochs': epochs,
+        'learning_rate': learning_rate,
+        'max_number': max_number,
+        'main_count': main_count,
+        'batch_size': batch_size,
+        'warm_start': model_state.get('trained_through'),
+    }
+    return cache.get_or_set(
+        'ai_model',
+        params,
+        lambda: _predict(
+            ordered,
+            seed=seed,
+            max_samples=max_samples,
+            hidden_size=hidden_size,
+            epochs=epochs,
+            learning_rate=learning_rate,
+            max_number=max_number,
+            main_count=main_count,
+            fingerprint=fingerprint,
+            model_state=model_state,
+            batch_size=batch_size,
+        ),
+        ttl=AI_CACHE_TTL,
     )
 
+
+def model_fingerprint(hidden_size: int, learning_rate: float, max_number: int) -> str:
+    payload = f"mlp:{hidden_size}:{learning_rate}:{max_number}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def encode_weights(model: dict) -> str:
+    # Stored as float16 to halve the snapshot payload; decode_weights lifts
+    # them back to float32 for training and inference.
+    buffer = io.BytesIO()
+    np.savez(buffer, **{name: np.asarray(value, dtype=np.float16) for name, value in model.items()})
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def decode_weights(data: str) -> dict:
+    with np.load(io.BytesIO(base64.b64decode(data))) as archive:
+        return {name: archive[name].astype(np.float32) for name in ('w1', 'b1', 'w2', 'b2')}
+
+
+def _predict(
+    ordered: List[Draw],
+    seed: str | None,
+    max_samples: int,
+    hidden_size: int,
+    epochs: int,
+    learning_rate: float,
+    max_number: int,
+    main_count: int,
+    fingerprint: str,
+    model_state: dict,
+    batch_size: int = 1,
+) -> Dict[str, Any]:
+    init = None
+    training_draws = ordered
+    if model_state:
+        # Fine-tune from the previous weights on the pairs that end in a draw
+        # newer than what the stored model has already seen.
+        trained_through = date.fromisoformat(model_state['trained_through'])
+        start = len(ordered)
+        while start > 0 and ordered[start - 1].date > trained_through:
+            start -= 1
+        init = decode_weights(model_state['weights'])
+        training_draws = ordered[max(start - 1, 0):]
+        epochs = FINE_TUNE_EPOCHS if len(training_draws) > 1 else 0
+
+    inputs, targets = _build_training_pairs(training_draws, max_samples=max_samples, max_number=max_number)
+    rng = np.random.default_rng(_seed_to_int(seed))
+    if init is not None and not len(inputs):
+        model = init
+    else:
+        model = _train_mlp(
+            inputs,
+            targets,
+            hidden_size=hidden_size,
+            epochs=epochs,
+            learning_rate=learning_rate,
+            rng=rng,
+            max_number=max_number,
+            batch_size=batch_size,
+            init=init,
+        )
+
     last_draw = ordered[-1]
     x = _multi_hot(last_draw.numbers, max_number=max_number)
     probs = _forward(model, x)
 
     probability_list = [
         {'number': idx + 1, 'probability': prob}
-        for idx, prob in enumerate(probs)
+        for idx, prob in enumerate(probs.tolist())
     ]
     top_numbers = [
         item['number']
@@ -65,6 +167,13 @@ def predict_next_draw_probabilities(
             'hidden_size': hidden_size,
             'epochs': epochs,
             'learning_rate': learning_rate,
+            'batch_size': batch_size,
+            'warm_start': init is not None,
+        },
+        'model': {
+            'fingerprint': fingerprint,
+            'trained_through': last_draw.date.isoformat(),
+            'weights': encode_weights(model),
         },
     }
 
@@ -73,89 +182,122 @@ def _build_training_pairs(
     draws: List[Draw],
     max_samples: int,
     max_number: int = 50,
-) -> tuple[list[list[float]], list[list[float]]]:
-    pairs = []
-    for current, nxt in zip(draws[:-1], draws[1:]):
-        pairs.append((_multi_hot(current.numbers, max_number=max_number), _multi_hot(nxt.numbers, max_number=max_number)))
-    if max_samples and len(pairs) > max_samples:
-        pairs = pairs[-max_samples:]
-    inputs = [p[0] for p in pairs]
-    targets = [p[1] for p in pairs]
-    return inputs, targets
+) -> tuple[np.ndarray, np.ndarray]:
+    if max_samples and len(draws) > max_samples + 1:
+        draws = draws[-(max_samples + 1):]
+    encoded = _multi_hot_batch([draw.numbers for draw in draws], max_number=max_number)
+    return encoded[:-1], encoded[1:]
+
+
+def _multi_hot(numbers: List[int], max_number: int = 50) -> np.ndarray:
+    return _multi_hot_batch([numbers], max_number=max_number)[0]
 
 
-def _multi_hot(numbers: List[int], max_number: int = 50) -> list[float]:
-    vec = [0.0] * max_number
-    for n in numbers:
-        if 1 <= n <= max_number:
-            vec[n - 1] = 1.0
-    return vec
+def _multi_hot_batch(number_lists: List[List[int]], max_number: int = 50) -> np.ndarray:
+    encoded = np.zeros((len(number_lists), max_number), dtype=np.uint8)
+    if number_lists:
+        # Draws are range-checked at ingestion, so every row is a full set of
+        # valid numbers and the whole matrix can be indexed in one step.
+        cols = np.asarray(number_lists, dtype=np.intp) - 1
+        encoded[np.arange(len(number_lists))[:, None], cols] = 1
+    return encoded
+
+
+def _seed_to_int(seed: str | None) -> int:
+    payload = str(seed or 42).encode('utf-8')
+    return int.from_bytes(hashlib.sha256(payload).digest()[:8], 'big')
 
 
 def _train_mlp(
-    inputs: list[list[float]],
-    targets: list[list[float]],
+    inputs: np.ndarray,
+    targets: np.ndarray,
     hidden_size: int,
     epochs: int,
     learning_rate: float,
-    rng: random.Random,
+    rng: np.random.Generator,
     max_number: int = 50,
+    batch_size: int = 1,
+    init: dict | None = None,
 ) -> dict:
     input_size = max_number
     output_size = max_number
 
-    w1 = [[rng.uniform(-0.08, 0.08) for _ in range(hidden_size)] for _ in range(input_size)]
-    b1 = [0.0 for _ in range(hidden_size)]
-    w2 = [[rng.uniform(-0.08, 0.08) for _ in range(output_size)] for _ in range(hidden_size)]
-    b2 = [0.0 for _ in range(output_size)]
+    if init is not None:
+        w1, b1, w2, b2 = (np.array(init[name], dtype=np.float32) for name in ('w1', 'b1', 'w2', 'b2'))
+    else:
+        w1 = rng.uniform(-0.08, 0.08, (input_size, hidden_size)).astype(np.float32)
+        b1 = np.zeros(hidden_size, dtype=np.float32)
+        w2 = rng.uniform(-0.08, 0.08, (hidden_size, output_size)).astype(np.float32)
+        b2 = np.zeros(output_size, dtype=np.float32)
 
-    for _ in range(max(epochs, 1)):
-        for x, y in zip(inputs, targets):
-            z1 = [b1[j] + _dot_col(x, w1, j) for j in range(hidden_size)]
-            h = [max(0.0, z) for z in z1]
-            z2 = [b2[k] + _dot_row(h, w2, k) for k in range(output_size)]
-            yhat = [1.0 / (1.0 + math.exp(-z)) for z in z2]
-
-            delta2 = [yhat[k] - y[k] for k in range(output_size)]
-            delta1 = []
-            for j in range(hidden_size):
-                back = sum(delta2[k] * w2[j][k] for k in range(output_size))
-                delta1.append(back if z1[j] > 0.0 else 0.0)
-
-            for j in range(hidden_size):
-                for k in range(output_size):
-                    w2[j][k] -= learning_rate * delta2[k] * h[j]
-            for k in range(output_size):
-                b2[k] -= learning_rate * delta2[k]
-
-            for i in range(input_size):
-                if x[i] == 0.0:
-                    continue
-                for j in range(hidden_size):
-                    w1[i][j] -= learning_rate * delta1[j] * x[i]
-            for j in range(hidden_size):
-                b1[j] -= learning_rate * delta1[j]
+    x = np.asarray(inputs, dtype=np.float32)
+    y = np.asarray(targets, dtype=np.float32)
+    samples = len(x)
+    # Mini-batches trade SGD updates for vectorised steps: at the same
+    # learning rate and epochs, batch_size=64 takes ~1/64 of the updates and
+    # undertrains, so the default stays per-sample.
+    batch_size = max(1, min(batch_size, samples))
 
-    return {'w1': w1, 'b1': b1, 'w2': w2, 'b2': b2}
+    # Work buffers are sized once for the (batch, hidden, output) shape and
+    # every step writes into them, so the inner loop does no allocation.
+    xb_buf = np.empty((batch_size, input_size), dtype=np.float32)
+    yb_buf = np.empty((batch_size, output_size), dtype=np.float32)
+    z1_buf = np.empty((batch_size, hidden_size), dtype=np.float32)
+    mask_buf = np.empty((batch_size, hidden_size), dtype=bool)
+    h_buf = np.empty((batch_size, hidden_size), dtype=np.float32)
+    z2_buf = np.empty((batch_size, output_size), dtype=np.float32)
+    dz1_buf = np.empty((batch_size, hidden_size), dtype=np.float32)
+    grad_w1 = np.empty_like(w1)
+    grad_w2 = np.empty_like(w2)
 
+    for _ in range(max(epochs, 1)):
+        # batch_size=1 reproduces the original in-order per-sample SGD.
+        order = rng.permutation(samples) if batch_size > 1 else np.arange(samples)
+        for start in range(0, samples, batch_size):
+            idx = order[start:start + batch_size]
+            size = len(idx)
+            xb = np.take(x, idx, axis=0, out=xb_buf[:size])
+            yb = np.take(y, idx, axis=0, out=yb_buf[:size])
+            scale = learning_rate / size
+
+            z1 = np.matmul(xb, w1, out=z1_buf[:size])
+            z1 += b1
+            mask = np.greater(z1, 0.0, out=mask_buf[:size])
+            h = np.multiply(z1, mask, out=h_buf[:size])
+            # Turn the output pre-activation into sigmoid(z2) - y in place so
+            # the prediction is never materialised as a separate array.
+            dz2 = np.matmul(h, w2, out=z2_buf[:size])
+            dz2 += b2
+            _sigmoid(dz2, out=dz2)
+            dz2 -= yb
+            dz1 = np.matmul(dz2, w2.T, out=dz1_buf[:size])
+            dz1 *= mask
 
-def _forward(model: dict, x: list[float]) -> list[float]:
-    w1 = model['w1']
-    b1 = model['b1']
-    w2 = model['w2']
-    b2 = model['b2']
-    hidden_size = len(b1)
-    output_size = len(b2)
+            np.matmul(h.T, dz2, out=grad_w2)
+            grad_w2 *= scale
+            w2 -= grad_w2
+            b2 -= scale * dz2.sum(axis=0)
+            np.matmul(xb.T, dz1, out=grad_w1)
+            grad_w1 *= scale
+            w1 -= grad_w1
+            b1 -= scale * dz1.sum(axis=0)
 
-    z1 = [b1[j] + _dot_col(x, w1, j) for j in range(hidden_size)]
-    h = [max(0.0, z) for z in z1]
-    z2 = [b2[k] + _dot_row(h, w2, k) for k in range(output_size)]
-    return [1.0 / (1.0 + math.exp(-z)) for z in z2]
+    return {'w1': w1, 'b1': b1, 'w2': w2, 'b2': b2}
 
 
-def _dot_col(x: list[float], matrix: list[list[float]], col: int) -> float:
-    return sum(x[i] * matrix[i][col] for i in range(len(x)))
+def _forward(model: dict, x: np.ndarray) -> np.ndarray:
+    z1 = np.asarray(x, dtype=np.float32) @ model['w1'] + model['b1']
+    h = np.maximum(z1, 0.0)
+    z2 = h @ model['w2'] + model['b2']
+    return _sigmoid(z2)
 
 
-def _dot_row(x: list[float], matrix: list[list[float]], col: int) -> float:
-    return sum(x[j] * matrix[j][col] for j in range(len(x)))
+def _sigmoid(z: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    # sigmoid(z) == 0.5 * (1 + tanh(z / 2)); tanh needs no reciprocal and the
+    # clip keeps float32 inputs away from the denormal range.
+    out = np.clip(z, -30.0, 30.0, out=out)
+    out *= 0.5
+    np.tanh(out, out=out)
+    out += 1.0
+    out *= 0.5
+    return out
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
-from collections import Counter
-from dataclasses import dataclass
+from collections import namedtuple
+from dataclasses import asdict, dataclass
 from datetime import date
 from itertools import combinations
+import json
 from typing import List, Optional
 
 from django.conf import settings
+from django.db.models import Count, Max
+import numpy as np
 
 from ..models import Draw
 
 
+# Read-only view of the Draw columns analytics, recommendations and the
+# predictor use; skips model instantiation for large windows.
+DrawLite = namedtuple('DrawLite', 'game date numbers bonus hash')
+
+
 @dataclass
 class AnalysisResult:
     meta: dict
@@ -34,16 +42,62 @@ def get_draws(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     game: Optional[str] = None,
-) -> List[Draw]:
+    chronological: bool = False,
+) -> List[DrawLite]:
     game_key = game or settings.LOTTO_DEFAULT_GAME
-    qs = Draw.objects.filter(game=game_key).order_by('-date')
+    qs = Draw.objects.filter(game=game_key)
     if start_date:
         qs = qs.filter(date__gte=start_date)
     if end_date:
         qs = qs.filter(date__lte=end_date)
+    if chronological and not window:
+        qs = qs.order_by('date')
+    else:
+        qs = qs.order_by('-date')
     if window:
         qs = qs[:window]
-    return list(qs)
+    rows = qs.values_list(*DrawLite._fields)
+    if not window:
+        rows = rows.iterator(chunk_size=2000)
+    draws = [DrawLite._make(row) for row in rows]
+    if chronological and window:
+        draws.reverse()
+    return draws
+
+
+def draws_signature(game: Optional[str] = None) -> tuple:
+    # Read from the table itself, so draws added, corrected or deleted by any
+    # process (another worker, a cron run) change it; a per-process counter
+    # would not.
+    game_key = game or settings.LOTTO_DEFAULT_GAME
+    state = Draw.objects.filter(game=game_key).aggregate(
+        total=Count('id'),
+        latest=Max('date'),
+        updated=Max('updated_at'),
+    )
+    return (
+        state['total'],
+        state['latest'].isoformat() if state['latest'] else None,
+        state['updated'].isoformat() if state['updated'] else None,
+    )
+
+
+def analysis_cache_params(
+    game: str,
+    window: Optional[int],
+    rolling: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    draws: Optional[tuple] = None,
+) -> dict:
+    return {
+        'game': game,
+        'window': window,
+        'rolling': rolling,
+        'start_date': start_date,
+        'end_date': end_date,
+        'draws': draws if draws is not None else draws_signature(game),
+    }
 
 
 def compute_analysis(
@@ -56,60 +110,55 @@ def compute_analysis(
     small_threshold: Optional[int] = None,
 ) -> AnalysisResult:
     total_draws = len(draws)
-    main_counts: Counter[int] = Counter()
-    bonus_counts: Counter[int] = Counter()
-    sums = []
-    spans = []
-    odd_even_counts = Counter()
-    size_counts = Counter()
-    consecutive_hits = 0
-
     threshold = small_threshold if small_threshold is not None else max_number // 2
-    for draw in draws:
-        numbers = sorted(draw.numbers)
-        main_counts.update(numbers)
-        bonus_counts.update([draw.bonus])
-        draw_sum = sum(numbers)
-        sums.append(draw_sum)
-        spans.append(numbers[-1] - numbers[0])
-        odd_count = sum(1 for n in numbers if n % 2 == 1)
-        odd_even_counts[odd_count] += 1
-        small_count = sum(1 for n in numbers if n <= threshold)
-        size_counts[small_count] += 1
-        if any(b - a == 1 for a, b in zip(numbers, numbers[1:])):
-            consecutive_hits += 1
+
+    dates, nums, bonus = _materialize(draws, main_count)
+
+    main_count_array = np.bincount(nums.ravel(), minlength=max_number + 1)
+    main_counts = main_count_array.tolist()
+    bonus_counts = np.bincount(bonus, minlength=max_number + 1).tolist()
+    odd_even_counts = np.bincount((nums & 1).sum(axis=1), minlength=main_count + 1).tolist()
+    size_counts = np.bincount((nums <= threshold).sum(axis=1), minlength=main_count + 1).tolist()
+    sums = nums.sum(axis=1)
+    spans = nums[:, -1] - nums[:, 0]
+    consecutive_hits = int((np.diff(nums, axis=1) == 1).any(axis=1).sum())
 
     total_main_numbers = total_draws * main_count if total_draws else 1
     main_frequency = [
         {
             'number': num,
-            'count': main_counts.get(num, 0),
-            'probability': round(main_counts.get(num, 0) / total_main_numbers, 6),
+            'count': main_counts[num],
+            'probability': round(main_counts[num] / total_main_numbers, 6),
         }
         for num in range(1, max_number + 1)
     ]
     bonus_frequency = [
         {
             'number': num,
-            'count': bonus_counts.get(num, 0),
-            'probability': round(bonus_counts.get(num, 0) / max(total_draws, 1), 6),
+            'count': bonus_counts[num],
+            'probability': round(bonus_counts[num] / max(total_draws, 1), 6),
         }
         for num in range(1, max_number + 1)
     ]
 
-    omissions = _compute_omissions(draws, max_number)
-    hot_numbers = sorted(main_counts.items(), key=lambda item: item[1], reverse=True)[:10]
-    cold_numbers = sorted(omissions, key=lambda item: item['omission'], reverse=True)[:10]
+    omissions = _compute_omissions(nums, max_number)
+    hot_numbers = [
+        (num, main_counts[num])
+        for num in (_top_k(main_count_array[1:], 10) + 1).tolist()
+        if main_counts[num]
+    ]
+    omission_values = np.asarray([item['omission'] for item in omissions])
+    cold_numbers = [omissions[idx] for idx in _top_k(omission_values, 10).tolist()]
 
-    pair_frequency = _compute_combinations(draws, 2, top_pairs)
-    triplet_frequency = _compute_combinations(draws, 3, top_triplets)
+    pair_frequency = _compute_combinations(nums, 2, top_pairs)
+    triplet_frequency = _compute_combinations(nums, 3, top_triplets)
 
     odd_even_distribution = [
-        {'odd_count': odd, 'count': odd_even_counts.get(odd, 0)}
+        {'odd_count': odd, 'count': odd_even_counts[odd]}
         for odd in range(0, main_count + 1)
     ]
     size_distribution = [
-        {'small_count': small, 'count': size_counts.get(small, 0)}
+        {'small_count': small, 'count': size_counts[small]}
         for small in range(0, main_count + 1)
     ]
 
@@ -122,7 +171,7 @@ def compute_analysis(
         'total': total_draws,
     }
 
-    rolling_series = _compute_rolling_series(draws, rolling_window)
+    rolling_series = _compute_rolling_series(dates, nums, rolling_window)
 
     meta = {
         'total_draws': total_draws,
@@ -149,71 +198,108 @@ def compute_analysis(
     )
 
 
-def _compute_omissions(draws: List[Draw], max_number: int = 50) -> list:
-    latest_index = {num: None for num in range(1, max_number + 1)}
-    for idx, draw in enumerate(draws):
-        for number in draw.numbers:
-            if latest_index[number] is None:
-                latest_index[number] = idx
-    omissions = []
-    for num in range(1, max_number + 1):
-        omission = latest_index[num] if latest_index[num] is not None else len(draws)
-        omissions.append({'number': num, 'omission': omission})
-    return omissions
-
-
-def _compute_combinations(draws: List[Draw], size: int, top_n: int) -> list:
-    counter: Counter[tuple] = Counter()
-    for draw in draws:
-        for combo in combinations(sorted(draw.numbers), size):
-            counter[combo] += 1
+def analysis_json(result: AnalysisResult) -> str:
+    # The API response is exactly the result's fields, so cache this string
+    # and serve it as-is instead of re-encoding the dataclass on every hit.
+    return json.dumps(asdict(result), separators=(',', ':'))
+
+
+def _top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest values, largest first, ties by lower index."""
+    values = np.asarray(values)
+    # A stable sort keeps equal values in index order, so ties at the k-th
+    # boundary always resolve to the lowest indices.
+    return np.argsort(-values, kind='stable')[:max(k, 0)]
+
+
+def _materialize(draws: List[Draw], main_count: int = 7) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (dates, numbers, bonus) arrays with one row per draw.
+
+    Rows keep the order of ``draws`` (newest first when they come from
+    get_draws) and each row of ``numbers`` is sorted ascending.
+    """
+    dates = np.array([draw.date for draw in draws], dtype='datetime64[D]')
+    nums = np.asarray([draw.numbers for draw in draws], dtype=np.int16).reshape(len(draws), main_count)
+    nums.sort(axis=1)
+    bonus = np.asarray([draw.bonus for draw in draws], dtype=np.int16)
+    return dates, nums, bonus
+
+
+def _compute_omissions(nums: np.ndarray, max_number: int = 50) -> list:
+    # Rows are newest first, so the first row containing a number is its omission.
+    total = len(nums)
+    if not total:
+        return [{'number': num, 'omission': 0} for num in range(1, max_number + 1)]
+    presence = np.zeros((total, max_number + 1), dtype=bool)
+    presence[np.arange(total)[:, None], nums] = True
+    latest = np.where(presence.any(axis=0), presence.argmax(axis=0), total).tolist()
     return [
-        {'numbers': list(combo), 'count': count}
-        for combo, count in counter.most_common(top_n)
+        {'number': num, 'omission': latest[num]}
+        for num in range(1, max_number + 1)
     ]
 
 
-def _build_histogram(values: List[int], bin_size: int) -> list:
-    if not values:
+def _compute_combinations(nums: np.ndarray, size: int, top_n: int) -> list:
+    if not len(nums) or nums.shape[1] < size:
         return []
-    min_value = min(values)
-    max_value = max(values)
-    bins = list(range(min_value - (min_value % bin_size), max_value + bin_size, bin_size))
-    counts = Counter()
-    for value in values:
-        bucket = (value // bin_size) * bin_size
-        counts[bucket] += 1
+    # Pack each sorted combination into one integer key (base max+1 digits)
+    # so counting is a single bincount instead of hashing tuples.
+    base = int(nums.max()) + 1
+    columns = np.asarray(list(combinations(range(nums.shape[1]), size)))
+    picked = nums[:, columns].astype(np.int64)
+    keys = np.zeros(picked.shape[:2], dtype=np.int64)
+    for level in range(size):
+        keys = keys * base + picked[:, :, level]
+    counts = np.bincount(keys.ravel())
+    present = np.flatnonzero(counts)
+    top_keys = present[_top_k(counts[present], top_n)]
+
+    results = []
+    for key in top_keys.tolist():
+        count = int(counts[key])
+        combo = []
+        for _ in range(size):
+            key, digit = divmod(key, base)
+            combo.append(digit)
+        results.append({'numbers': combo[::-1], 'count': count})
+    return results
+
+
+def _build_histogram(values: np.ndarray, bin_size: int) -> list:
+    if not len(values):
+        return []
+    min_value = int(values.min())
+    max_value = int(values.max())
+    bins = range(min_value - (min_value % bin_size), max_value + bin_size, bin_size)
+    counts = np.bincount(values // bin_size - min_value // bin_size, minlength=len(bins)).tolist()
     return [
-        {'bin_start': b, 'count': counts.get(b, 0)}
-        for b in bins
+        {'bin_start': b, 'count': count}
+        for b, count in zip(bins, counts)
     ]
 
 
-def _compute_rolling_series(draws: List[Draw], window: int) -> dict:
-    if not draws:
+def _compute_rolling_series(dates: np.ndarray, nums: np.ndarray, window: int) -> dict:
+    if not len(nums):
         return {'labels': [], 'series': []}
 
-    chrono_draws = list(sorted(draws, key=lambda d: d.date))
-    main_counts = Counter()
-    for draw in draws:
-        main_counts.update(draw.numbers)
-    top_numbers = [num for num, _ in main_counts.most_common(5)]
-
-    prefix = {num: [] for num in top_numbers}
-    counts = {num: 0 for num in top_numbers}
-    for draw in chrono_draws:
-        for num in top_numbers:
-            counts[num] += 1 if num in draw.numbers else 0
-            prefix[num].append(counts[num])
-
-    labels = [draw.date.isoformat() for draw in chrono_draws]
-    series = []
-    for num in top_numbers:
-        data_points = []
-        for idx in range(len(chrono_draws)):
-            start_idx = idx - window
-            window_total = prefix[num][idx] - (prefix[num][start_idx] if start_idx >= 0 else 0)
-            data_points.append(window_total / max(window, 1))
-        series.append({'number': num, 'values': data_points})
+    order = np.argsort(dates, kind='stable')
+    main_counts = np.bincount(nums.ravel())
+    top_numbers = [num for num in _top_k(main_counts, 5).tolist() if main_counts[num]]
+
+    # hits[i, k] is 1 when the i-th draw (oldest first) contains top_numbers[k].
+    chrono = nums[order]
+    hits = (chrono[:, :, None] == np.asarray(top_numbers, dtype=nums.dtype)).any(axis=1)
+    cumul = np.cumsum(hits, axis=0)
+    if window > 0:
+        windowed = cumul.copy()
+        windowed[window:] -= cumul[:-window]
+    else:
+        windowed = np.zeros_like(cumul)
+    values = windowed / max(window, 1)
 
+    labels = np.datetime_as_string(dates[order], unit='D').tolist()
+    series = [
+        {'number': num, 'values': values[:, k].tolist()}
+        for k, num in enumerate(top_numbers)
+    ]
     return {'labels': labels, 'series': series}
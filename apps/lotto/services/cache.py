@@ -6,11 +6,13 @@ from typing import Any, Callable
 
 from django.core.cache import cache
 
+DRAWS_VERSION_KEY = 'lotto:draws-version:{game}'
+
 
 class AnalysisCache:
     def build_key(self, name: str, params: dict) -> str:
         payload = json.dumps(params, sort_keys=True, default=str)
-        digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+        digest = hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
         return f"analysis:{name}:{digest}"
 
     def get_or_set(self, name: str, params: dict, factory: Callable[[], Any], ttl: int | None = None) -> Any:
@@ -21,3 +23,15 @@ class AnalysisCache:
         value = factory()
         cache.set(key, value, ttl)
         return value
+
+
+def get_draws_version(game: str) -> int:
+    return cache.get_or_set(DRAWS_VERSION_KEY.format(game=game), 0, None)
+
+
+def bump_draws_version(game: str) -> None:
+    key = DRAWS_VERSION_KEY.format(game=game)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 from django.conf import settings
 
@@ -21,6 +22,9 @@ class GameConfig:
         return max(1, self.max_number // 2)
 
 
+# Game settings are fixed for the life of the process, so configs are built
+# once; signals.py clears these caches if the settings are overridden.
+@lru_cache(maxsize=None)
 def get_game_config(game_key: str | None) -> GameConfig:
     games = settings.LOTTO_GAMES
     default_key = getattr(settings, 'LOTTO_DEFAULT_GAME', next(iter(games)))
@@ -38,5 +42,6 @@ def get_game_config(game_key: str | None) -> GameConfig:
     )
 
 
-def get_supported_games() -> list[GameConfig]:
-    return [get_game_config(key) for key in settings.LOTTO_GAMES.keys()]
+@lru_cache(maxsize=None)
+def get_supported_games() -> tuple[GameConfig, ...]:
+    return tuple(get_game_config(key) for key in settings.LOTTO_GAMES.keys())
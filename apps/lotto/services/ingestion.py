@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import date
 import hashlib
+from itertools import groupby
 import logging
 from typing import Iterable, List, Optional
 
@@ -10,15 +11,17 @@ from django.utils import timezone
 
 from django.conf import settings
 
-from ..models import Draw, DrawNumber, IngestionLog
-from .analytics import compute_analysis, get_draws
-from .cache import AnalysisCache
+from ..models import Draw, IngestionLog
+from .analytics import analysis_cache_params, analysis_json, compute_analysis, get_draws
+from .cache import AnalysisCache, bump_draws_version
 from .game_config import get_game_config
 from .scrapers.base import DrawRecord, ScrapeError
 from .scrapers.registry import fetch_draws
 
 logger = logging.getLogger('lotto')
 
+DRAW_BATCH_SIZE = 1000
+
 
 def normalize_numbers(numbers: Iterable[int]) -> List[int]:
     unique = sorted({int(n) for n in numbers})
@@ -39,8 +42,19 @@ def validate_draw(record: DrawRecord, main_count: int, max_number: int) -> tuple
 
 
 def compute_hash(game: str, draw_date: date, numbers: List[int], bonus: int) -> str:
-    payload = f"{game}|{draw_date.isoformat()}|{'-'.join(map(str, numbers))}|{bonus}"
-    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    payload = f"{game}|{draw_date.isoformat()}|{'-'.join(map(str, numbers))}|{bonus}".encode('utf-8')
+    if settings.LOTTO_CONFIG['DRAW_HASH'] == 'blake2b':
+        return hashlib.blake2b(payload, digest_size=32).hexdigest()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _save_log(log: IngestionLog | None, **fields) -> IngestionLog:
+    if log is None:
+        return IngestionLog.objects.create(**fields)
+    for name, value in fields.items():
+        setattr(log, name, value)
+    log.save()
+    return log
 
 
 def ingest_draws(
@@ -49,6 +63,7 @@ def ingest_draws(
     source: str = 'auto',
     incremental: bool = False,
     game: str | None = None,
+    log: IngestionLog | None = None,
 ) -> dict:
     game_config = get_game_config(game)
     game_key = game_config.key
@@ -75,7 +90,8 @@ def ingest_draws(
         source_name, records = fetch_draws(source=source, max_pages=max_pages, game=game_key)
     except ScrapeError as exc:
         message = f"{exc} ({exc.detail})"
-        IngestionLog.objects.create(
+        _save_log(
+            log,
             status='failed',
             game=game_key,
             source=exc.source,
@@ -88,24 +104,25 @@ def ingest_draws(
     if since:
         records = [record for record in records if record.date >= since]
 
-    deduped: dict[date, DrawRecord] = {}
-    for record in records:
-        deduped[record.date] = record
-
-    records = list(deduped.values())
-    records.sort(key=lambda r: r.date, reverse=True)
+    # Newest date first; sorting the reversed list keeps the last scraped
+    # record first within each date, so that one wins as before.
+    records = sorted(reversed(records), key=lambda r: r.date, reverse=True)
+    records = [next(group) for _, group in groupby(records, key=lambda r: r.date)]
 
     if records:
         min_date = records[-1].date
         max_date = records[0].date
 
+    # Only the columns the conflict check needs; rows stay plain tuples.
     existing_draws = {
-        draw.date: draw
-        for draw in Draw.objects.filter(game=game_key, date__in=[record.date for record in records])
+        draw_date: (numbers, bonus)
+        for draw_date, numbers, bonus in Draw.objects.filter(
+            game=game_key,
+            date__in=sorted(record.date for record in records),
+        ).values_list('date', 'numbers', 'bonus').iterator(chunk_size=500)
     }
 
     new_draws: List[Draw] = []
-    new_draw_numbers: List[DrawNumber] = []
     skipped = 0
 
     for record in records:
@@ -121,7 +138,7 @@ def ingest_draws(
 
         existing = existing_draws.get(record.date)
         if existing:
-            if existing.numbers == numbers and existing.bonus == bonus:
+            if existing == (numbers, bonus):
                 continue
             logger.error('Conflict detected for %s, existing draw differs from scraped data', record.date)
             skipped += 1
@@ -137,28 +154,36 @@ def ingest_draws(
         )
         new_draws.append(new_draw)
 
-    with transaction.atomic():
-        created_draws = Draw.objects.bulk_create(new_draws)
-        for draw in created_draws:
-            for number in draw.numbers:
-                new_draw_numbers.append(DrawNumber(draw=draw, number=number, is_bonus=False))
-            new_draw_numbers.append(DrawNumber(draw=draw, number=draw.bonus, is_bonus=True))
-        DrawNumber.objects.bulk_create(new_draw_numbers)
-
-    draws_added = len(new_draws)
     status = 'success' if skipped == 0 else 'partial'
-    message = f"Processed {draws_processed} draws, added {draws_added}, skipped {skipped}"
-
-    IngestionLog.objects.create(
-        status=status,
-        game=game_key,
-        source=source_name,
-        message=message,
-        draws_processed=draws_processed,
-        draws_added=draws_added,
-        min_date=min_date,
-        max_date=max_date,
-    )
+
+    with transaction.atomic():
+        if new_draws:
+            game_draws = Draw.objects.filter(game=game_key)
+            count_before = game_draws.count()
+            Draw.objects.bulk_create(
+                new_draws,
+                batch_size=DRAW_BATCH_SIZE,
+                # A draw inserted concurrently is left as is; conflicting data is
+                # reported above rather than overwritten.
+                ignore_conflicts=True,
+            )
+            # Ignored conflicts are not reported back, so count what landed.
+            draws_added = game_draws.count() - count_before
+        message = f"Processed {draws_processed} draws, added {draws_added}, skipped {skipped}"
+        _save_log(
+            log,
+            status=status,
+            game=game_key,
+            source=source_name,
+            message=message,
+            draws_processed=draws_processed,
+            draws_added=draws_added,
+            min_date=min_date,
+            max_date=max_date,
+        )
+    if draws_added:
+        # bulk_create bypasses post_save, so invalidate draw-derived caches here.
+        bump_draws_version(game_key)
 
     try:
         window = settings.LOTTO_CONFIG['DEFAULT_WINDOW']
@@ -167,15 +192,15 @@ def ingest_draws(
 
         def compute():
             analysis_draws = get_draws(window=window, game=game_key)
-            return compute_analysis(
+            return analysis_json(compute_analysis(
                 analysis_draws,
                 rolling_window=rolling,
                 max_number=game_config.max_number,
                 main_count=game_config.main_count,
                 small_threshold=game_config.small_threshold,
-            )
+            ))
 
-        cache.get_or_set('analysis', {'game': game_key, 'window': window, 'rolling': rolling}, compute)
+        cache.get_or_set('analysis_json', analysis_cache_params(game_key, window, rolling), compute)
     except Exception as exc:
         logger.warning('Post-ingest analysis cache failed: %s', exc)
 
@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import random
 import hashlib
+import heapq
 import math
-from collections import Counter
-from dataclasses import dataclass
-from itertools import combinations
+from dataclasses import asdict, dataclass
 from typing import List, Tuple
 
-from .analytics import _compute_omissions
+import numpy as np
+
+from .analytics import _compute_omissions, _materialize, _top_k
 from ..models import Draw
 
 
@@ -37,6 +38,14 @@ def jaccard(a: set, b: set) -> float:
     return len(a & b) / max(len(a | b), 1)
 
 
+def number_mask(numbers) -> int:
+    # Bit n is set when n is present, so set counts become int.bit_count().
+    mask = 0
+    for n in numbers:
+        mask |= 1 << n
+    return mask
+
+
 class RecommendationEngine:
     def __init__(
         self,
@@ -46,63 +55,78 @@ class RecommendationEngine:
         main_count: int = 7,
         max_number: int = 50,
         small_threshold: int | None = None,
+        materialized: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None,
     ):
         self.draws = draws
         self.random = random.Random(seed)
+        self._np_random = np.random.default_rng(_seed_int(seed))
         self.lang = 'en' if lang == 'en' else 'zh'
         self.main_count = main_count
         self.max_number = max_number
         self.small_threshold = small_threshold if small_threshold is not None else max_number // 2
 
-        self.main_counts = Counter()
-        for draw in draws:
-            self.main_counts.update(draw.numbers)
+        dates, nums, _ = materialized if materialized is not None else _materialize(draws, main_count)
+        # Oldest-first numbers and their presence matrix, shared with the
+        # algorithm tickets in build_recommendations.
+        self.chrono_numbers = nums[np.argsort(dates, kind='stable')]
+        self.presence = _presence_matrix(self.chrono_numbers, max_number=max_number)
+        self.main_counts = np.bincount(nums.ravel(), minlength=max_number + 1)
 
-        omissions = _compute_omissions(draws, max_number)
+        omissions = _compute_omissions(nums, max_number)
         hot_limit = min(10, max_number)
-        self.hot_numbers = [num for num, _ in self.main_counts.most_common(hot_limit)]
-        self.cold_numbers = [
-            item['number']
-            for item in sorted(omissions, key=lambda i: i['omission'], reverse=True)[:hot_limit]
+        self.hot_numbers = [
+            num for num in (_top_k(self.main_counts[1:], hot_limit) + 1).tolist()
+            if self.main_counts[num]
         ]
+        omission_values = np.asarray([item['omission'] for item in omissions])
+        self.cold_numbers = [omissions[idx]['number'] for idx in _top_k(omission_values, hot_limit).tolist()]
         if not self.hot_numbers:
             self.hot_numbers = list(range(1, hot_limit + 1))
         if not self.cold_numbers:
             start = max(1, max_number - hot_limit + 1)
             self.cold_numbers = list(range(start, max_number + 1))
-        self.neutral_pool = [
-            n for n in range(1, max_number + 1)
-            if n not in set(self.hot_numbers + self.cold_numbers)
-        ]
-
-        odd_counts = [sum(1 for n in draw.numbers if n % 2 == 1) for draw in draws]
-        size_counts = [sum(1 for n in draw.numbers if n <= self.small_threshold) for draw in draws]
-        sums = [sum(draw.numbers) for draw in draws]
+        self._universe = np.arange(1, max_number + 1)
+        self._hot_mask = number_mask(self.hot_numbers)
+        self._cold_mask = number_mask(self.cold_numbers)
+        self._odd_mask = number_mask(range(1, max_number + 1, 2))
+        self._small_mask = number_mask(range(1, self.small_threshold + 1))
+        tagged_mask = self._hot_mask | self._cold_mask
+        self.neutral_pool = [n for n in range(1, max_number + 1) if not tagged_mask >> n & 1]
+
+        odd_counts = (nums & 1).sum(axis=1)
+        size_counts = (nums <= self.small_threshold).sum(axis=1)
+        sums = nums.sum(axis=1)
 
         fallback_target = max(1, main_count // 2)
-        self.target_odd = _mode(odd_counts) if odd_counts else fallback_target
-        self.target_small = _mode(size_counts) if size_counts else fallback_target
+        self.target_odd = _mode(odd_counts) if len(odd_counts) else fallback_target
+        self.target_small = _mode(size_counts) if len(size_counts) else fallback_target
         self.sum_range = (
             _percentile_range(sums, 0.25, 0.75)
-            if sums
+            if len(sums)
             else (main_count * 10, main_count * (max_number - 10))
         )
-        self.common_pairs = _top_pairs(draws, top_n=15)
+        self.common_pairs = _top_pairs(self.presence, top_n=15)
+        self._pair_masks = [number_mask(pair) for pair in self.common_pairs]
 
     def generate(self, count: int = 5, max_similarity: float = 0.4) -> List[Recommendation]:
         recommendations: List[Recommendation] = []
+        accepted_masks: List[int] = []
+        # Every ticket has main_count numbers, so |A | B| = 2 * main_count - |A & B|
+        # and jaccard > max_similarity reduces to a bound on the intersection.
+        max_shared = 2 * self.main_count * max_similarity / (1 + max_similarity)
         attempts = 0
         while len(recommendations) < count and attempts < count * 300:
             attempts += 1
-            numbers = self._build_candidate()
-            if not self._passes_constraints(numbers):
+            numbers, mask = self._build_candidate()
+            if not self._passes_constraints(numbers, mask):
                 continue
-            if any(jaccard(set(numbers), set(rec.numbers)) > max_similarity for rec in recommendations):
+            if any((mask & other).bit_count() > max_shared for other in accepted_masks):
                 continue
+            accepted_masks.append(mask)
             recommendations.append(self._build_recommendation(numbers))
         return recommendations
 
-    def _build_candidate(self) -> List[int]:
+    def _build_candidate(self) -> Tuple[List[int], int]:
         selection = set()
         hot_pick = min(3, len(self.hot_numbers))
         cold_pick = min(2, len(self.cold_numbers))
@@ -117,26 +141,27 @@ class RecommendationEngine:
             pair = self.random.choice(self.common_pairs)
             selection.update(pair)
 
-        pool = [n for n in range(1, self.max_number + 1) if n not in selection]
-        while len(selection) < self.main_count:
-            selection.add(self.random.choice(pool))
-        return sorted(selection)
-
-    def _passes_constraints(self, numbers: List[int]) -> bool:
-        odd_count = sum(1 for n in numbers if n % 2 == 1)
-        small_count = sum(1 for n in numbers if n <= self.small_threshold)
-        total_sum = sum(numbers)
-        if abs(odd_count - self.target_odd) > 2:
+        missing = self.main_count - len(selection)
+        if missing > 0:
+            available = np.ones(self.max_number, dtype=bool)
+            available[np.fromiter(selection, dtype=np.intp, count=len(selection)) - 1] = False
+            pool = self._universe[available]
+            selection.update(self._np_random.choice(pool, size=missing, replace=False).tolist())
+        return sorted(selection), number_mask(selection)
+
+    def _passes_constraints(self, numbers: List[int], mask: int | None = None) -> bool:
+        # Checks run from most to least likely to reject, each only when needed.
+        if mask is None:
+            mask = number_mask(numbers)
+        if abs((mask & self._odd_mask).bit_count() - self.target_odd) > 2:
             return False
-        if abs(small_count - self.target_small) > 2:
+        if abs((mask & self._small_mask).bit_count() - self.target_small) > 2:
             return False
-        if not (self.sum_range[0] <= total_sum <= self.sum_range[1]):
+        if not (self.sum_range[0] <= sum(numbers) <= self.sum_range[1]):
             return False
-        hot_count = sum(1 for n in numbers if n in self.hot_numbers)
-        cold_count = sum(1 for n in numbers if n in self.cold_numbers)
-        if self.hot_numbers and hot_count < 1:
+        if self.hot_numbers and not mask & self._hot_mask:
             return False
-        if self.cold_numbers and cold_count < 1:
+        if self.cold_numbers and not mask & self._cold_mask:
             return False
         return True
 
@@ -161,14 +186,15 @@ class RecommendationEngine:
         lang: str | None = None,
     ) -> Recommendation:
         lang = 'en' if (lang or self.lang) == 'en' else 'zh'
-        odd_count = sum(1 for n in numbers if n % 2 == 1)
+        mask = number_mask(numbers)
+        odd_count = (mask & self._odd_mask).bit_count()
         even_count = self.main_count - odd_count
-        small_count = sum(1 for n in numbers if n <= self.small_threshold)
+        small_count = (mask & self._small_mask).bit_count()
         large_count = self.main_count - small_count
         total_sum = sum(numbers)
-        hot_count = sum(1 for n in numbers if n in self.hot_numbers)
-        cold_count = sum(1 for n in numbers if n in self.cold_numbers)
-        pair_boost = sum(1 for pair in self.common_pairs if set(pair).issubset(numbers))
+        hot_count = (mask & self._hot_mask).bit_count()
+        cold_count = (mask & self._cold_mask).bit_count()
+        pair_boost = sum(1 for pair_mask in self._pair_masks if mask & pair_mask == pair_mask)
 
         if algorithm_label is None:
             algorithm_label = _lang_text(lang, '热冷平衡综合策略', 'Balanced Hot/Cold Mix')
@@ -227,6 +253,7 @@ def build_recommendations(
     lang: str = 'zh',
     main_count: int = 7,
     max_number: int = 50,
+    materialized: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None,
 ) -> List[Recommendation]:
     if not draws:
         return []
@@ -238,6 +265,7 @@ def build_recommendations(
         lang=lang,
         main_count=main_count,
         max_number=max_number,
+        materialized=materialized,
     )
     recommendations: List[Recommendation] = []
 
@@ -272,11 +300,11 @@ def build_recommendations(
         )
     )
 
-    draw_numbers = _draw_numbers(draws)
+    presence = engine.presence
     rng = _seeded_random(seed, 'algorithms')
 
     # Algorithm 1: Dirichlet smoothed probabilities
-    p_hat = _dirichlet_probabilities(draw_numbers, alpha=1.0, max_number=max_number, main_count=main_count)
+    p_hat = _dirichlet_probabilities(presence, alpha=1.0, max_number=max_number, main_count=main_count)
     alg1_ticket = _weighted_sample_without_replacement(p_hat, main_count, rng)
     recommendations.append(
         engine.build_recommendation(
@@ -292,11 +320,11 @@ def build_recommendations(
     )
 
     # Algorithm 2: Binomial z-score
-    z_stats = _binomial_z_scores(draw_numbers, max_number=max_number, main_count=main_count)
-    alg2_ticket = [num for num, _ in sorted(z_stats.items(), key=lambda item: item[1], reverse=True)[:main_count]]
+    z_stats = _binomial_z_scores(presence, max_number=max_number, main_count=main_count)
+    alg2_ticket = _top_ticket(z_stats, main_count)
     recommendations.append(
         engine.build_recommendation(
-            sorted(alg2_ticket),
+            alg2_ticket,
             algorithm='SingleNumberSignificanceTest_BinomialZ',
             algorithm_label=_lang_text(lang, '二项显著性 Z 分数', 'Binomial Z-Score Significance'),
             summary=_lang_text(lang, '二项分布 z-score 最高的号码', 'Top numbers by binomial z-score'),
@@ -312,11 +340,11 @@ def build_recommendations(
     )
 
     # Algorithm 3: Windowed Bayesian + EWMA
-    ewma_scores = _ewma_scores(draw_numbers, window=200, alpha=1.0, decay=0.2, max_number=max_number, main_count=main_count)
-    alg3_ticket = [num for num, _ in sorted(ewma_scores.items(), key=lambda item: item[1], reverse=True)[:main_count]]
+    ewma_scores = _ewma_scores(presence, window=200, alpha=1.0, decay=0.2, max_number=max_number, main_count=main_count)
+    alg3_ticket = _top_ticket(ewma_scores, main_count)
     recommendations.append(
         engine.build_recommendation(
-            sorted(alg3_ticket),
+            alg3_ticket,
             algorithm='WindowedBayesianHotness_EWMA',
             algorithm_label=_lang_text(lang, 'EWMA 近期热度', 'EWMA Recent Hotness'),
             summary=_lang_text(lang, '滑动窗口 + EWMA 的近期热度', 'Windowed Bayesian + EWMA recency score'),
@@ -329,7 +357,7 @@ def build_recommendations(
 
     # Algorithm 4: Feature distribution Monte Carlo
     alg4_ticket = _feature_distribution_ticket(
-        draw_numbers,
+        engine.chrono_numbers,
         rng,
         main_count=main_count,
         max_number=max_number,
@@ -364,11 +392,11 @@ def build_recommendations(
     )
 
     # Algorithm 6: Change point detection
-    segment_probs = _change_point_segment_probabilities(draw_numbers, max_number=max_number, main_count=main_count)
-    alg6_ticket = [num for num, _ in sorted(segment_probs.items(), key=lambda item: item[1], reverse=True)[:main_count]]
+    segment_probs = _change_point_segment_probabilities(presence, max_number=max_number, main_count=main_count)
+    alg6_ticket = _top_ticket(segment_probs, main_count)
     recommendations.append(
         engine.build_recommendation(
-            sorted(alg6_ticket),
+            alg6_ticket,
             algorithm='ChangePointDetection_NumberFrequencies',
             algorithm_label=_lang_text(lang, '变点检测分段概率', 'Change-Point Segment Probabilities'),
             summary=_lang_text(lang, '变点检测后，使用最新区段概率', 'Use smoothed probabilities from the latest segment'),
@@ -406,76 +434,95 @@ def build_recommendation_snapshot_payload(
     seed: str | None = None,
     main_count: int = 7,
     max_number: int = 50,
-) -> list[dict]:
-    zh_recs = build_recommendations(draws, seed=seed, lang='zh', main_count=main_count, max_number=max_number)
-    en_recs = build_recommendations(draws, seed=seed, lang='en', main_count=main_count, max_number=max_number)
+) -> dict:
+    # Both languages run the same engine, so materialise the draw matrix once.
+    materialized = _materialize(draws, main_count)
+    zh_recs = build_recommendations(
+        draws, seed=seed, lang='zh', main_count=main_count, max_number=max_number, materialized=materialized
+    )
+    en_recs = build_recommendations(
+        draws, seed=seed, lang='en', main_count=main_count, max_number=max_number, materialized=materialized
+    )
     en_by_alg = {rec.algorithm: rec for rec in en_recs}
 
-    payload = []
-    for zh_rec in zh_recs:
-        en_rec = en_by_alg.get(zh_rec.algorithm)
-        payload.append({
-            'numbers': zh_rec.numbers,
-            'algorithm': zh_rec.algorithm,
-            'metrics': {
-                'odd_count': zh_rec.odd_count,
-                'even_count': zh_rec.even_count,
-                'small_count': zh_rec.small_count,
-                'large_count': zh_rec.large_count,
-                'total_sum': zh_rec.total_sum,
-                'hot_count': zh_rec.hot_count,
-                'cold_count': zh_rec.cold_count,
-                'pair_boost': zh_rec.pair_boost,
-            },
-            'texts': {
-                'zh': {
-                    'label': zh_rec.algorithm_label,
-                    'summary': zh_rec.algorithm_summary,
-                    'explanation': zh_rec.explanation,
-                },
-                'en': {
-                    'label': (en_rec.algorithm_label if en_rec else zh_rec.algorithm_label),
-                    'summary': (en_rec.algorithm_summary if en_rec else zh_rec.algorithm_summary),
-                    'explanation': (en_rec.explanation if en_rec else zh_rec.explanation),
-                },
-            },
+    # Items are stored already flattened per language, in the shape the page
+    # renders, so reading a snapshot is a single lookup.
+    return {
+        'by_lang': {
+            'zh': [asdict(rec) for rec in zh_recs],
+            'en': [_localized_item(rec, en_by_alg.get(rec.algorithm, rec)) for rec in zh_recs],
+        },
+    }
+
+
+def snapshot_items(payload, lang: str) -> list[dict]:
+    lang_key = 'en' if lang == 'en' else 'zh'
+    if isinstance(payload, dict):
+        return payload['by_lang'][lang_key]
+    # Snapshots saved before payloads were split by language.
+    items = []
+    for item in payload:
+        texts = item.get('texts', {}).get(lang_key, {})
+        metrics = item.get('metrics', {})
+        items.append({
+            'numbers': item.get('numbers', []),
+            'algorithm': item.get('algorithm'),
+            'algorithm_label': texts.get('label', ''),
+            'algorithm_summary': texts.get('summary', ''),
+            'explanation': texts.get('explanation', []),
+            'odd_count': metrics.get('odd_count', 0),
+            'even_count': metrics.get('even_count', 0),
+            'small_count': metrics.get('small_count', 0),
+            'large_count': metrics.get('large_count', 0),
+            'total_sum': metrics.get('total_sum', 0),
+            'hot_count': metrics.get('hot_count', 0),
+            'cold_count': metrics.get('cold_count', 0),
+            'pair_boost': metrics.get('pair_boost', 0),
         })
-    return payload
+    return items
+
+
+def _localized_item(rec: Recommendation, text_rec: Recommendation) -> dict:
+    item = asdict(rec)
+    item['algorithm_label'] = text_rec.algorithm_label
+    item['algorithm_summary'] = text_rec.algorithm_summary
+    item['explanation'] = text_rec.explanation
+    return item
 
 
-def _mode(values: List[int]) -> int:
-    if not values:
+def _mode(values: np.ndarray) -> int:
+    if not len(values):
         return 3
-    counts = Counter(values)
-    return counts.most_common(1)[0][0]
+    return int(_top_k(np.bincount(values), 1)[0])
 
 
-def _percentile_range(values: List[int], low: float, high: float) -> Tuple[int, int]:
-    sorted_values = sorted(values)
-    if not sorted_values:
+def _percentile_range(values: np.ndarray, low: float, high: float) -> Tuple[int, int]:
+    if not len(values):
         return 60, 240
-    low_idx = int(len(sorted_values) * low)
-    high_idx = int(len(sorted_values) * high) - 1
-    low_value = sorted_values[max(low_idx, 0)]
-    high_value = sorted_values[max(high_idx, 0)]
-    return low_value, high_value
+    low_idx = max(int(len(values) * low), 0)
+    high_idx = max(int(len(values) * high) - 1, 0)
+    # Only the two order statistics are needed, so select them instead of sorting.
+    partitioned = np.partition(values, [low_idx, high_idx])
+    return int(partitioned[low_idx]), int(partitioned[high_idx])
 
 
-def _top_pairs(draws: List[Draw], top_n: int = 10) -> List[Tuple[int, int]]:
-    counter = Counter()
-    for draw in draws:
-        for combo in combinations(sorted(draw.numbers), 2):
-            counter[combo] += 1
-    return [pair for pair, _ in counter.most_common(top_n)]
+def _top_pairs(presence: np.ndarray, top_n: int = 10) -> List[Tuple[int, int]]:
+    presence = presence.astype(np.int32)
+    cooccurrence = presence.T @ presence
+    rows, cols = np.triu_indices(presence.shape[1], k=1)
+    values = cooccurrence[rows, cols]
+    top = [idx for idx in _top_k(values, top_n).tolist() if values[idx]]
+    return [(int(rows[idx]) + 1, int(cols[idx]) + 1) for idx in top]
 
 
-def _top_numbers(counts: Counter, k: int) -> List[int]:
-    return [num for num, _ in counts.most_common(k)]
+def _top_numbers(counts: np.ndarray, k: int) -> List[int]:
+    return [num for num in (_top_k(counts[1:], k) + 1).tolist() if counts[num]]
 
 
-def _draw_numbers(draws: List[Draw]) -> List[List[int]]:
-    ordered = sorted(draws, key=lambda d: d.date)
-    return [sorted(draw.numbers) for draw in ordered]
+def _seed_int(seed: str | None) -> int | None:
+    if seed is None:
+        return None
+    return int.from_bytes(hashlib.sha256(str(seed).encode('utf-8')).digest()[:8], 'big')
 
 
 def _seeded_random(seed: str | None, salt: str) -> random.Random:
@@ -486,99 +533,96 @@ def _seeded_random(seed: str | None, salt: str) -> random.Random:
     return random.Random(digest)
 
 
+def _presence_matrix(draws, max_number: int = 50) -> np.ndarray:
+    # presence[i, n - 1] is 1 when number n was drawn in draws[i].
+    presence = np.zeros((len(draws), max_number), dtype=np.int8)
+    if len(draws):
+        cols = np.asarray(draws, dtype=np.intp) - 1
+        presence[np.arange(len(draws))[:, None], cols] = 1
+    return presence
+
+
+def _top_ticket(scores: np.ndarray, k: int) -> List[int]:
+    # scores[n - 1] belongs to number n; ties go to the lower number.
+    return sorted((_top_k(scores, k) + 1).tolist())
+
+
 def _dirichlet_probabilities(
-    draws: List[List[int]],
+    presence: np.ndarray,
     alpha: float = 1.0,
     max_number: int = 50,
     main_count: int = 7,
-) -> dict[int, float]:
-    counts = Counter()
-    for draw in draws:
-        counts.update(draw)
-    total_events = len(draws) * main_count
-    denom = total_events + max_number * alpha
-    return {i: (counts.get(i, 0) + alpha) / denom for i in range(1, max_number + 1)}
-
-
-def _binomial_z_scores(draws: List[List[int]], max_number: int = 50, main_count: int = 7) -> dict[int, float]:
-    counts = Counter()
-    for draw in draws:
-        counts.update(draw)
-    total_draws = len(draws)
+) -> np.ndarray:
+    counts = presence.sum(axis=0)
+    denom = len(presence) * main_count + max_number * alpha
+    return (counts + alpha) / denom
+
+
+def _binomial_z_scores(presence: np.ndarray, max_number: int = 50, main_count: int = 7) -> np.ndarray:
+    counts = presence.sum(axis=0)
+    total_draws = len(presence)
     q = main_count / max_number
     expected = total_draws * q
     variance = max(total_draws * q * (1 - q), 1e-9)
-    z_stats = {}
-    for i in range(1, max_number + 1):
-        z_stats[i] = (counts.get(i, 0) - expected) / (variance ** 0.5)
-    return z_stats
+    return (counts - expected) / (variance ** 0.5)
 
 
 def _ewma_scores(
-    draws: List[List[int]],
+    presence: np.ndarray,
     window: int,
     alpha: float,
     decay: float,
     max_number: int = 50,
     main_count: int = 7,
-) -> dict[int, float]:
-    scores = {i: 1 / max_number for i in range(1, max_number + 1)}
-    counts = Counter()
-    window_draws: List[List[int]] = []
-
-    for draw in draws:
-        window_draws.append(draw)
-        counts.update(draw)
-        if len(window_draws) > window:
-            removed = window_draws.pop(0)
-            for n in removed:
-                counts[n] -= 1
-                if counts[n] <= 0:
-                    del counts[n]
-        total_events = len(window_draws) * main_count
-        denom = total_events + max_number * alpha
-        for i in range(1, max_number + 1):
-            p_window = (counts.get(i, 0) + alpha) / denom
-            scores[i] = (1 - decay) * scores[i] + decay * p_window
-
-    return scores
-
-
-def _weighted_sample_without_replacement(weights: dict[int, float], k: int, rng: random.Random) -> List[int]:
+) -> np.ndarray:
+    steps = len(presence)
+    initial = np.full(max_number, 1 / max_number)
+    if not steps:
+        return initial
+
+    # Window counts at every step from one cumulative sum.
+    cumul = np.cumsum(presence, axis=0, dtype=np.int64)
+    counts = cumul.copy()
+    counts[window:] -= cumul[:-window]
+    lengths = np.minimum(np.arange(1, steps + 1), window)
+    p_window = (counts + alpha) / (lengths * main_count + max_number * alpha)[:, None]
+
+    # Unrolled recurrence scores = (1 - decay) * scores + decay * p_window.
+    keep = 1 - decay
+    weights = decay * keep ** np.arange(steps - 1, -1, -1)
+    return keep ** steps * initial + weights @ p_window
+
+
+def _weighted_sample_without_replacement(weights: np.ndarray, k: int, rng: random.Random) -> List[int]:
+    # log(u) / w orders items exactly like the A-Res key u ** (1 / w).
     keys = []
-    for num, weight in weights.items():
+    for num, weight in enumerate(weights.tolist(), start=1):
         if weight <= 0:
             continue
         u = rng.random()
-        key = u ** (1.0 / weight)
-        keys.append((key, num))
-    keys.sort(reverse=True)
-    return sorted([num for _, num in keys[:k]])
+        keys.append((math.log(u) / weight if u > 0 else -math.inf, num))
+    return sorted(num for _, num in heapq.nlargest(k, keys))
+
+
+MONTE_CARLO_TICKETS = 3000
 
 
 def _feature_distribution_ticket(
-    draws: List[List[int]],
+    draws: np.ndarray,
     rng: random.Random,
     main_count: int = 7,
     max_number: int = 50,
     small_threshold: int = 25,
 ) -> List[int]:
-    features = [_extract_features(draw, small_threshold=small_threshold) for draw in draws]
-    means, stds = _feature_stats(features)
-
-    best_ticket = None
-    best_distance = float('inf')
-    for _ in range(3000):
-        ticket = sorted(rng.sample(range(1, max_number + 1), main_count))
-        f = _extract_features(ticket, small_threshold=small_threshold)
-        distance = 0.0
-        for key in means:
-            std = stds[key] or 1.0
-            distance += abs((f[key] - means[key]) / std)
-        if distance < best_distance:
-            best_distance = distance
-            best_ticket = ticket
-    return best_ticket or sorted(rng.sample(range(1, max_number + 1), main_count))
+    tickets = _random_tickets(rng, MONTE_CARLO_TICKETS, main_count, max_number)
+    if not len(draws):
+        return tickets[0].tolist()
+    features = _ticket_features(draws, small_threshold)
+    means = features.mean(axis=0)
+    stds = features.std(axis=0)
+    stds[stds == 0] = 1.0
+    distances = np.abs((_ticket_features(tickets, small_threshold) - means) / stds).sum(axis=1)
+    return tickets[int(np.argmin(distances))].tolist()
 
 
 def _anti_crowd_ticket(
@@ -587,136 +631,88 @@ def _anti_crowd_ticket(
     max_number: int = 50,
     small_threshold: int = 25,
 ) -> List[int]:
-    best_ticket = None
-    best_score = float('inf')
-    for _ in range(3000):
-        ticket = sorted(rng.sample(range(1, max_number + 1), main_count))
-        score = _popularity_penalty(ticket, main_count=main_count, small_threshold=small_threshold)
-        if score < best_score:
-            best_score = score
-            best_ticket = ticket
-    return best_ticket or sorted(rng.sample(range(1, max_number + 1), main_count))
-
-
-def _popularity_penalty(ticket: List[int], main_count: int = 7, small_threshold: int = 25) -> float:
-    penalty = 0.0
-    count_low31 = sum(1 for n in ticket if n <= 31)
-    penalty += 1.5 * max(0, count_low31 - max(2, main_count // 2))
-
-    consec = sum(1 for a, b in zip(ticket, ticket[1:]) if b == a + 1)
-    penalty += 1.0 * consec
-
-    last_digits = [n % 10 for n in ticket]
-    max_dup = max(last_digits.count(d) for d in set(last_digits))
-    penalty += 1.0 * max(0, max_dup - 2)
-
-    if _is_arithmetic_progression(ticket):
-        penalty += 2.5
-
-    if sum(1 for n in ticket if n % 5 == 0) >= max(3, main_count - 3):
-        penalty += 1.5
-
+    tickets = _random_tickets(rng, MONTE_CARLO_TICKETS, main_count, max_number)
+    scores = _popularity_penalties(tickets, main_count=main_count)
+    return tickets[int(np.argmin(scores))].tolist()
+
+
+def _random_tickets(rng: random.Random, count: int, main_count: int, max_number: int) -> np.ndarray:
+    # Sorted rows of distinct numbers; the numpy stream is seeded from rng so
+    # tickets stay reproducible for a given recommendation seed.
+    gen = np.random.default_rng(rng.getrandbits(64))
+    picks = np.argpartition(gen.random((count, max_number)), main_count - 1, axis=1)[:, :main_count]
+    picks.sort(axis=1)
+    return picks + 1
+
+
+def _row_value_counts(values: np.ndarray, size: int) -> np.ndarray:
+    # counts[i, v] is how often v occurs in values[i]; values lie in [0, size).
+    offsets = np.arange(len(values))[:, None] * size
+    return np.bincount((values + offsets).ravel(), minlength=len(values) * size).reshape(len(values), size)
+
+
+def _ticket_features(tickets: np.ndarray, small_threshold: int = 25) -> np.ndarray:
+    # Columns: sum, odd, small, consecutive pairs, gap entropy; rows must be sorted ascending.
+    gaps = np.diff(tickets, axis=1)
+    gap_counts = _row_value_counts(gaps, int(tickets.max()) + 1)
+    probs = gap_counts / max(gaps.shape[1], 1)
+    logs = np.log(probs, out=np.zeros_like(probs), where=gap_counts > 0)
+    gap_entropy = -(probs * logs).sum(axis=1)
+    return np.column_stack([
+        tickets.sum(axis=1),
+        (tickets & 1).sum(axis=1),
+        (tickets <= small_threshold).sum(axis=1),
+        (gaps == 1).sum(axis=1),
+        gap_entropy,
+    ])
+
+
+def _popularity_penalties(tickets: np.ndarray, main_count: int = 7) -> np.ndarray:
+    # Penalise birthday-heavy, consecutive, same-tail, arithmetic and
+    # multiple-of-five patterns; rows must be sorted ascending.
+    gaps = np.diff(tickets, axis=1)
+    penalty = 1.5 * np.maximum(0, (tickets <= 31).sum(axis=1) - max(2, main_count // 2))
+    penalty = penalty + 1.0 * (gaps == 1).sum(axis=1)
+    max_dup = _row_value_counts(tickets % 10, 10).max(axis=1)
+    penalty = penalty + 1.0 * np.maximum(0, max_dup - 2)
+    if tickets.shape[1] >= 3:
+        penalty = penalty + 2.5 * (gaps == gaps[:, :1]).all(axis=1)
+    penalty = penalty + 1.5 * ((tickets % 5 == 0).sum(axis=1) >= max(3, main_count - 3))
     return penalty
 
 
-def _is_arithmetic_progression(ticket: List[int]) -> bool:
-    if len(ticket) < 3:
-        return False
-    diffs = [b - a for a, b in zip(ticket, ticket[1:])]
-    return all(d == diffs[0] for d in diffs)
-
-
-def _extract_features(draw: List[int], small_threshold: int = 25) -> dict[str, float]:
-    sorted_draw = sorted(draw)
-    sumv = sum(sorted_draw)
-    odd = sum(1 for n in sorted_draw if n % 2 == 1)
-    small = sum(1 for n in sorted_draw if n <= small_threshold)
-    consec = sum(1 for a, b in zip(sorted_draw, sorted_draw[1:]) if b == a + 1)
-    gaps = [b - a for a, b in zip(sorted_draw, sorted_draw[1:])]
-    gap_entropy = _entropy(gaps)
-    return {
-        'sum': sumv,
-        'odd': odd,
-        'small': small,
-        'consec': consec,
-        'gap_entropy': gap_entropy,
-    }
-
-
-def _feature_stats(features: List[dict[str, float]]) -> tuple[dict[str, float], dict[str, float]]:
-    keys = features[0].keys() if features else []
-    means = {}
-    stds = {}
-    for key in keys:
-        values = [f[key] for f in features]
-        mean = sum(values) / max(len(values), 1)
-        variance = sum((v - mean) ** 2 for v in values) / max(len(values), 1)
-        means[key] = mean
-        stds[key] = variance ** 0.5
-    return means, stds
-
-
-def _entropy(values: List[int]) -> float:
-    if not values:
-        return 0.0
-    counts = Counter(values)
-    total = sum(counts.values())
-    entropy = 0.0
-    for count in counts.values():
-        p = count / total
-        entropy -= p * (0.0 if p <= 0 else math.log(p))
-    return entropy
-
-
 def _change_point_segment_probabilities(
-    draws: List[List[int]],
+    presence: np.ndarray,
     max_number: int = 50,
     main_count: int = 7,
-) -> dict[int, float]:
-    if not draws:
-        return {i: 1 / max_number for i in range(1, max_number + 1)}
-    max_draws = min(len(draws), 600)
-    segment_draws = draws[-max_draws:]
+) -> np.ndarray:
+    if not len(presence):
+        return np.full(max_number, 1 / max_number)
+    max_draws = min(len(presence), 600)
+    segment_draws = presence[-max_draws:]
     n = len(segment_draws)
     min_segment = 120 if n >= 240 else max(20, n // 4)
     penalty = 150.0
 
-    prefix = [[0] * (max_number + 1)]
-    for draw in segment_draws:
-        prev = prefix[-1][:]
-        for nnum in draw:
-            prev[nnum] += 1
-        prefix.append(prev)
-
-    def segment_cost(start: int, end: int) -> float:
-        counts = [prefix[end][i] - prefix[start - 1][i] for i in range(1, max_number + 1)]
-        total = sum(counts)
-        epsilon = 1e-6
-        cost = 0.0
-        denom = total + max_number * epsilon
-        for count in counts:
-            if count == 0:
-                continue
-            p = (count + epsilon) / denom
-            cost -= count * math.log(p)
-        return cost
+    # prefix[i] holds per-number counts over the first i draws of the segment.
+    prefix = np.zeros((n + 1, max_number), dtype=np.int32)
+    np.cumsum(segment_draws, axis=0, out=prefix[1:])
 
     change_points: List[int] = []
 
     def recurse(start: int, end: int):
         if end - start + 1 < 2 * min_segment:
             return
-        best_split = None
-        best_gain = 0.0
-        cost_full = segment_cost(start, end)
-        for split in range(start + min_segment, end - min_segment + 1):
-            cost_left = segment_cost(start, split)
-            cost_right = segment_cost(split + 1, end)
-            gain = cost_full - (cost_left + cost_right)
-            if gain > best_gain:
-                best_gain = gain
-                best_split = split
-        if best_split and best_gain > penalty:
+        # Score every candidate split at once: one row of counts per split.
+        splits = np.arange(start + min_segment, end - min_segment + 1)
+        cost_full = _segment_costs(prefix[end] - prefix[start - 1])
+        cost_left = _segment_costs(prefix[splits] - prefix[start - 1])
+        cost_right = _segment_costs(prefix[end] - prefix[splits])
+        gains = cost_full - (cost_left + cost_right)
+        best = int(np.argmax(gains))
+        best_gain = float(gains[best])
+        if best_gain > 0 and best_gain > penalty:
+            best_split = int(splits[best])
             change_points.append(best_split)
             recurse(start, best_split)
             recurse(best_split + 1, end)
@@ -727,3 +723,10 @@ def _change_point_segment_probabilities(
     last_start = (change_points[-1] + 1) if change_points else 1
     last_segment = segment_draws[last_start - 1 :]
     return _dirichlet_probabilities(last_segment, alpha=1.0, max_number=max_number, main_count=main_count)
+
+
+def _segment_costs(counts: np.ndarray, epsilon: float = 1e-6) -> np.ndarray:
+    # Multinomial negative log-likelihood of each row of counts.
+    totals = counts.sum(axis=-1, keepdims=True)
+    probs = (counts + epsilon) / (totals + counts.shape[-1] * epsilon)
+    return -np.where(counts > 0, counts * np.log(probs), 0.0).sum(axis=-1)
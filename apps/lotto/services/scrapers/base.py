@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import date
-from typing import List
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Callable, Iterator, List, Sequence
 import logging
+import threading
+from lxml import html as lxml_html
+from dateutil import parser as date_parser
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 DEFAULT_HEADERS = {
     'User-Agent': (
@@ -14,9 +21,71 @@ DEFAULT_HEADERS = {
     ),
 }
 
+# C-backed parser for BeautifulSoup; much faster than the stdlib html.parser.
+HTML_PARSER = 'lxml'
+# Concurrent page fetches per scraper.
+PAGE_FETCH_WORKERS = 8
+# Requests in flight across all scrapers; auto mode runs sources side by
+# side, each with its own page workers, so the cap is enforced in http_get.
+MAX_CONCURRENT_REQUESTS = 8
+
 logger = logging.getLogger('lotto')
 
 
+def _build_session() -> requests.Session:
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_REQUESTS, max_retries=retry)
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Shared by all scrapers so paginated and repeated fetches reuse connections.
+http_session = _build_session()
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    with _request_slots:
+        return http_session.get(url, **kwargs)
+
+
+def parse_html_tree(html: str):
+    # lxml refuses empty documents; treat them as a page with no rows.
+    if not html or not html.strip():
+        return lxml_html.document_fromstring('<html></html>')
+    return lxml_html.document_fromstring(html)
+
+
+def node_text(node) -> str:
+    # Same joining rule as BeautifulSoup's get_text(' ', strip=True).
+    return ' '.join(part.strip() for part in node.xpath('.//text()') if part.strip())
+
+
+@lru_cache(maxsize=4096)
+def parse_fuzzy_date(text: str, dayfirst: bool = False) -> date | None:
+    # Draw dates repeat across pages and runs, so cache dateutil's slow parse.
+    try:
+        return date_parser.parse(text, fuzzy=True, dayfirst=dayfirst).date()
+    except (ValueError, TypeError) as exc:
+        logger.debug('Failed to parse date from %s: %s', text, exc)
+        return None
+
+
+def parse_date_formats(text: str, formats: Sequence[str], dayfirst: bool = False) -> date | None:
+    # Regex-matched dates have a known shape; strptime skips dateutil's
+    # format guessing and the fuzzy parse only runs when none fit.
+    normalized = ' '.join(text.replace(',', ' ').split())
+    for fmt in formats:
+        try:
+            return datetime.strptime(normalized, fmt).date()
+        except ValueError:
+            continue
+    return parse_fuzzy_date(text, dayfirst=dayfirst)
+
+
 class ScrapeError(RuntimeError):
     def __init__(self, message: str, source: str, detail: str | None = None):
         super().__init__(message)
@@ -24,7 +93,7 @@ class ScrapeError(RuntimeError):
         self.detail = detail or ''
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DrawRecord:
     date: date
     numbers: List[int]
@@ -50,8 +119,31 @@ class BaseScraper:
     def _get(self, url: str) -> str:
         logger.info('Fetching %s from %s', self.name, url)
         try:
-            response = requests.get(url, timeout=20, headers=DEFAULT_HEADERS)
+            response = http_get(url, timeout=20)
             response.raise_for_status()
         except requests.RequestException as exc:
             raise ScrapeError('Failed to fetch data', self.name, str(exc)) from exc
         return response.text
+
+    def _fetch_pages(
+        self,
+        urls: List[str],
+        fetch: Callable[[str], str] | None = None,
+        workers: int = PAGE_FETCH_WORKERS,
+    ) -> Iterator[tuple[str, str | None]]:
+        # Yields (url, html) in order; failed pages yield None. Pages are
+        # scheduled a batch at a time so callers can stop early.
+        fetch = fetch or self._get
+
+        def fetch_or_none(url: str) -> str | None:
+            try:
+                return fetch(url)
+            except ScrapeError as exc:
+                logger.warning('Failed to fetch %s page %s: %s', self.name, url, exc)
+                return None
+
+        workers = max(1, workers)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'{self.name}-fetch') as executor:
+            for start in range(0, len(urls), workers):
+                batch = urls[start:start + workers]
+                yield from zip(batch, executor.map(fetch_or_none, batch))
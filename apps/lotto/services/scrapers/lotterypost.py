@@ -7,21 +7,32 @@ from urllib.parse import urlparse
 
 import requests
 from bs4 import BeautifulSoup
-from dateutil import parser as date_parser
-
-from .base import BaseScraper, DrawRecord, ScrapeError, logger
+import soupsieve
+
+from .base import (
+    DEFAULT_HEADERS,
+    HTML_PARSER,
+    BaseScraper,
+    DrawRecord,
+    ScrapeError,
+    http_get,
+    logger,
+    parse_date_formats,
+    parse_fuzzy_date,
+)
 
-NUMBER_PATTERN = re.compile(r'\b\d+\b')
+NUMBER_PATTERN = re.compile(r'\b\d+\b', re.ASCII)
 DATE_PATTERNS = [
-    re.compile(r'\b\w+\s+\d{1,2},\s*\d{4}\b'),
-    re.compile(r'\b\d{1,2}/\d{1,2}/\d{4}\b'),
-    re.compile(r'\b\d{4}-\d{2}-\d{2}\b'),
+    (re.compile(r'\b\w+\s+\d{1,2},\s*\d{4}\b'), ('%B %d %Y', '%b %d %Y')),
+    (re.compile(r'\b\d{1,2}/\d{1,2}/\d{4}\b', re.ASCII), ('%m/%d/%Y',)),
+    (re.compile(r'\b\d{4}-\d{2}-\d{2}\b', re.ASCII), ('%Y-%m-%d',)),
 ]
-USER_AGENT = (
-    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
-    'AppleWebKit/537.36 (KHTML, like Gecko) '
-    'Chrome/123.0 Safari/537.36'
-)
+BLOCKED_PATTERN = re.compile(r'cloudflare|just a moment|attention required', re.IGNORECASE)
+# Compiled once; soup.select() would re-parse the selector for every row.
+ROW_SELECTOR = soupsieve.compile('tr')
+BALL_SELECTOR = soupsieve.compile('.ball, .balls li, .results__ball, .result__ball, .number')
+BONUS_SELECTOR = soupsieve.compile('.bonus, .ball.bonus, .results__bonus')
+USER_AGENT = DEFAULT_HEADERS['User-Agent']
 
 
 class LotteryPostScraper(BaseScraper):
@@ -37,20 +48,22 @@ class LotteryPostScraper(BaseScraper):
     def fetch_draws(self, max_pages: int | None = None) -> List[DrawRecord]:
         html = self._fetch_html(self.base_url)
         self._current_url = self.base_url
-        records = self.parse_draws(html)
+        # The base page is the largest document; parse it once for both
+        # draws and pagination links.
+        soup = BeautifulSoup(html, HTML_PARSER)
+        records = self._parse_draws_from_soup(soup)
 
-        page_urls = self._extract_page_urls(html)
+        page_urls = self._extract_page_urls(soup)
         if max_pages is not None:
             if max_pages <= 1:
                 page_urls = []
             else:
                 page_urls = page_urls[:max_pages - 1]
 
-        for page_url in page_urls:
-            try:
-                page_html = self._fetch_html(page_url)
-            except ScrapeError as exc:
-                logger.warning('LotteryPost page fetch failed: %s', exc)
+        # Sequential on purpose: any page can fall back to a Chromium launch,
+        # and LotteryPost blocks bursts of requests.
+        for page_url, page_html in self._fetch_pages(page_urls, fetch=self._fetch_html, workers=1):
+            if page_html is None:
                 continue
             self._current_url = page_url
             records.extend(self.parse_draws(page_html))
@@ -62,11 +75,19 @@ class LotteryPostScraper(BaseScraper):
         return results
 
     def parse_draws(self, html: str) -> List[DrawRecord]:
-        soup = BeautifulSoup(html, 'html.parser')
-        records: List[DrawRecord] = []
+        return self._parse_draws_from_soup(BeautifulSoup(html, HTML_PARSER))
 
-        rows = soup.select('tr')
+    def _parse_draws_from_soup(self, soup: BeautifulSoup) -> List[DrawRecord]:
+        # Pages can mix table rows and result <div>s, so parse both and
+        # keep one record per date.
+        rows = ROW_SELECTOR.select(soup)
         rows.extend(self._result_containers(soup))
+        deduped = {record.date: record for record in self._parse_rows(rows)}
+        return list(deduped.values())
+
+    def _parse_rows(self, rows: list) -> List[DrawRecord]:
+        records: List[DrawRecord] = []
+        main_count = self.main_count
 
         for row in rows:
             text = row.get_text(' ', strip=True)
@@ -76,7 +97,7 @@ class LotteryPostScraper(BaseScraper):
             if not draw_date:
                 continue
             numbers = self._extract_numbers(row, text)
-            if len(numbers) < self.main_count:
+            if len(numbers) < main_count:
                 continue
             bonus = self._extract_bonus(row, numbers)
             if bonus is None:
@@ -84,7 +105,7 @@ class LotteryPostScraper(BaseScraper):
             records.append(
                 DrawRecord(
                     date=draw_date,
-                    numbers=numbers[: self.main_count],
+                    numbers=numbers[:main_count],
                     bonus=bonus,
                     source_url=self._current_url or self.base_url,
                 )
@@ -94,7 +115,7 @@ class LotteryPostScraper(BaseScraper):
 
     def _fetch_html(self, url: str) -> str:
         try:
-            response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=20)
+            response = http_get(url, timeout=20)
             if response.status_code == 200 and not self._is_blocked(response.text):
                 return response.text
         except requests.RequestException as exc:
@@ -130,8 +151,8 @@ class LotteryPostScraper(BaseScraper):
         return html
 
     def _is_blocked(self, html: str) -> bool:
-        lowered = html.lower()
-        return 'cloudflare' in lowered or 'just a moment' in lowered or 'attention required' in lowered
+        # Case-insensitive search avoids lowercasing a copy of the whole page.
+        return BLOCKED_PATTERN.search(html) is not None
 
     def _result_containers(self, soup: BeautifulSoup) -> List[BeautifulSoup]:
         containers = []
@@ -143,16 +164,17 @@ class LotteryPostScraper(BaseScraper):
 
     def _extract_numbers(self, row, text: str) -> List[int]:
         balls = []
-        for node in row.select('.ball, .balls li, .results__ball, .result__ball, .number'):
+        for node in BALL_SELECTOR.select(row):
             value = node.get_text(strip=True)
             if value.isdigit():
                 balls.append(int(value))
-        if len(balls) >= self.main_count:
-            return [n for n in balls if 1 <= n <= self.max_number]
-        return [int(n) for n in NUMBER_PATTERN.findall(text) if 1 <= int(n) <= self.max_number]
+        max_number = self.max_number
+        if len(balls) < self.main_count:
+            balls = map(int, NUMBER_PATTERN.findall(text))
+        return [n for n in balls if 1 <= n <= max_number]
 
     def _extract_bonus(self, row, numbers: List[int]) -> Optional[int]:
-        bonus_nodes = row.select('.bonus, .ball.bonus, .results__bonus')
+        bonus_nodes = BONUS_SELECTOR.select(row)
         for node in bonus_nodes:
             value = node.get_text(strip=True)
             if value.isdigit():
@@ -160,22 +182,18 @@ class LotteryPostScraper(BaseScraper):
         return numbers[self.main_count] if len(numbers) >= self.main_count + 1 else None
 
     def _extract_date(self, text: str) -> Optional[date]:
-        for pattern in DATE_PATTERNS:
+        for pattern, formats in DATE_PATTERNS:
             match = pattern.search(text)
             if match:
-                return self._parse_date(match.group(0))
+                return parse_date_formats(match.group(0), formats)
         return None
 
     def _parse_date(self, text: str) -> Optional[date]:
-        try:
-            return date_parser.parse(text, fuzzy=True, dayfirst=False).date()
-        except (ValueError, TypeError) as exc:
-            logger.debug('LotteryPost date parse failed for %s: %s', text, exc)
-            return None
-
-    def _extract_page_urls(self, html: str) -> List[str]:
-        soup = BeautifulSoup(html, 'html.parser')
-        urls = set()
+        return parse_fuzzy_date(text)
+
+    def _extract_page_urls(self, soup: BeautifulSoup) -> List[str]:
+        # dict keeps document order (pages are linked in sequence) while deduplicating.
+        urls: dict[str, None] = {}
         for link in soup.find_all('a', href=True):
             href = link['href']
             if self._path_hint and self._path_hint not in href:
@@ -183,6 +201,6 @@ class LotteryPostScraper(BaseScraper):
             if href.startswith('/'):
                 href = f"https://www.lotterypost.com{href}"
             if 'page=' in href or href.rstrip('/').split('/')[-1].isdigit():
-                urls.add(href)
-        urls.discard(self.base_url)
-        return sorted(urls)
+                urls[href] = None
+        urls.pop(self.base_url, None)
+        return list(urls)
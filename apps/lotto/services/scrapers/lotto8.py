@@ -2,15 +2,13 @@ from __future__ import annotations
 
 import re
 from datetime import date
-from typing import List
+from typing import Dict, List
 
-from bs4 import BeautifulSoup
-from dateutil import parser as date_parser
+from .base import BaseScraper, DrawRecord, ScrapeError, logger, node_text, parse_fuzzy_date, parse_html_tree
 
-from .base import BaseScraper, DrawRecord, ScrapeError, logger
-
-NUMBER_PATTERN = re.compile(r'\d+')
-DATE_PATTERN = re.compile(r'(\d{2}/\d{2}\s+\d{2}|\d{2}/\d{2}/\d{4}|\d{4}-\d{2}-\d{2}|\d{4}/\d{2}/\d{2})')
+NUMBER_PATTERN = re.compile(r'\d+', re.ASCII)
+PAGE_INDEX_PATTERN = re.compile(r'indexpage=(\d+)', re.ASCII)
+DATE_PATTERN = re.compile(r'(\d{2}/\d{2}\s+\d{2}|\d{2}/\d{2}/\d{4}|\d{4}-\d{2}-\d{2}|\d{4}/\d{2}/\d{2})', re.ASCII)
 
 
 class Lotto8Scraper(BaseScraper):
@@ -28,14 +26,16 @@ class Lotto8Scraper(BaseScraper):
 
         records = self.parse_draws(html)
         seen_dates = {record.date for record in records}
+        parsed: Dict[int, List[DrawRecord] | None] = {}
+        if fallback_mode:
+            max_index = self._probe_last_page(max_index, seen_dates, parsed)
+        page_urls = {self._page_url(page): page for page in range(2, max_index + 1) if page not in parsed}
+        for page_url, page_html in self._fetch_pages(list(page_urls)):
+            parsed[page_urls[page_url]] = self.parse_draws(page_html) if page_html is not None else None
         for page in range(2, max_index + 1):
-            page_url = f"{self.base_url}?indexpage={page}&orderby=new"
-            try:
-                page_html = self._get(page_url)
-            except ScrapeError as exc:
-                logger.warning('Failed to fetch page %s: %s', page, exc)
+            page_records = parsed[page]
+            if page_records is None:
                 continue
-            page_records = self.parse_draws(page_html)
             new_records = [record for record in page_records if record.date not in seen_dates]
             if not new_records and fallback_mode:
                 break
@@ -49,21 +49,56 @@ class Lotto8Scraper(BaseScraper):
             raise ScrapeError('No draws parsed from Lotto-8 page', self.name, 'Check table structure')
         return results
 
+    def _page_url(self, page: int) -> str:
+        return f"{self.base_url}?indexpage={page}&orderby=new"
+
+    def _probe_last_page(self, limit: int, seen_dates: set, parsed: Dict[int, List[DrawRecord] | None]) -> int:
+        # Without pagination links, find the last page that still has unseen
+        # draws by doubling then bisecting, instead of walking every page.
+        # Probed pages are kept in ``parsed`` so they are not fetched twice.
+        def has_new(page: int) -> bool:
+            if page not in parsed:
+                try:
+                    parsed[page] = self.parse_draws(self._get(self._page_url(page)))
+                except ScrapeError as exc:
+                    logger.warning('Failed to fetch %s page %s: %s', self.name, page, exc)
+                    parsed[page] = None
+            if parsed[page] is None:
+                # A failed fetch says nothing about where the draws end;
+                # judge by the next page instead.
+                return page < limit and has_new(page + 1)
+            return any(record.date not in seen_dates for record in parsed[page])
+
+        low, high = 1, 2
+        while high < limit and has_new(high):
+            low, high = high, high * 2
+        if high >= limit:
+            if has_new(limit):
+                return limit
+            high = limit
+        while high - low > 1:
+            middle = (low + high) // 2
+            if has_new(middle):
+                low = middle
+            else:
+                high = middle
+        return low
+
     def parse_draws(self, html: str) -> List[DrawRecord]:
-        soup = BeautifulSoup(html, 'html.parser')
+        tree = parse_html_tree(html)
         records: List[DrawRecord] = []
-        for row in soup.find_all('tr'):
-            cells = [c.get_text(' ', strip=True) for c in row.find_all(['td', 'th'])]
+        for row in tree.xpath('//tr'):
+            cells = [node_text(cell) for cell in row.xpath('.//td|.//th')]
             if len(cells) < 3:
                 continue
             draw_date = self._parse_date(cells[0])
-            numbers = self._extract_numbers(cells[1])
-            bonus_values = self._extract_numbers(cells[2])
+            numbers = self._extract_numbers(cells[1], limit=self.main_count)
+            bonus_values = self._extract_numbers(cells[2], limit=1)
             if not draw_date or len(numbers) < self.main_count or not bonus_values:
                 continue
             record = DrawRecord(
                 date=draw_date,
-                numbers=numbers[: self.main_count],
+                numbers=numbers,
                 bonus=bonus_values[0],
                 source_url=self.base_url,
             )
@@ -86,29 +121,23 @@ class Lotto8Scraper(BaseScraper):
                 except ValueError as exc:
                     logger.debug('Invalid date parts %s: %s', value, exc)
                     return None
-        try:
-            return date_parser.parse(text, dayfirst=True, fuzzy=True).date()
-        except (ValueError, TypeError) as exc:
-            logger.debug('Failed to parse date from %s: %s', text, exc)
-            return None
+        return parse_fuzzy_date(text, dayfirst=True)
 
-    def _extract_numbers(self, text: str) -> List[int]:
+    def _extract_numbers(self, text: str, limit: int | None = None) -> List[int]:
+        max_number = self.max_number
         numbers = []
-        for value in NUMBER_PATTERN.findall(text):
-            try:
-                number = int(value)
-            except ValueError:
-                continue
-            if 1 <= number <= self.max_number:
+        for match in NUMBER_PATTERN.finditer(text):
+            number = int(match.group())
+            if 1 <= number <= max_number:
                 numbers.append(number)
+                if len(numbers) == limit:
+                    break
         return numbers
 
     def _extract_max_index(self, html: str) -> int:
-        soup = BeautifulSoup(html, 'html.parser')
         max_index = 1
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            match = re.search(r'indexpage=(\d+)', href)
+        for href in parse_html_tree(html).xpath('//a/@href'):
+            match = PAGE_INDEX_PATTERN.search(href)
             if match:
                 max_index = max(max_index, int(match.group(1)))
         return max_index
@@ -5,16 +5,40 @@ import re
 from datetime import date
 from typing import List
 
-from bs4 import BeautifulSoup
-from dateutil import parser as date_parser
+from .base import BaseScraper, DrawRecord, ScrapeError, node_text, parse_date_formats, parse_fuzzy_date, parse_html_tree
 
-from .base import BaseScraper, DrawRecord, ScrapeError, logger
-
-NUMBER_PATTERN = re.compile(r'\b\d+\b')
+NUMBER_PATTERN = re.compile(r'\b\d+\b', re.ASCII)
 DATE_PATTERNS = [
-    re.compile(r'\b\d{4}-\d{2}-\d{2}\b'),
-    re.compile(r'\b\w+\s+\d{1,2},\s*\d{4}\b'),
+    (re.compile(r'\b\d{4}-\d{2}-\d{2}\b', re.ASCII), ('%Y-%m-%d',)),
+    (re.compile(r'\b\w+\s+\d{1,2},\s*\d{4}\b'), ('%B %d %Y', '%b %d %Y')),
 ]
+BRACE_PATTERN = re.compile(r'\{')
+
+
+def _balanced_end(content: str, start: int) -> int | None:
+    # Index just past the brace closing content[start], ignoring braces
+    # inside JSON strings; None when it never closes.
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(content)):
+        char = content[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    return None
 
 
 class OlgScraper(BaseScraper):
@@ -25,10 +49,12 @@ class OlgScraper(BaseScraper):
         return self.parse_draws(html)
 
     def parse_draws(self, html: str) -> List[DrawRecord]:
-        soup = BeautifulSoup(html, 'html.parser')
-        draws: List[DrawRecord] = []
-        draws.extend(self._parse_json_blocks(soup))
-        draws.extend(self._parse_table_rows(soup))
+        # One lxml parse serves both the embedded JSON and the results table.
+        # The JSON may hold only the latest draw while the table lists the
+        # history, so both are always merged.
+        tree = parse_html_tree(html)
+        draws = self._parse_json_blocks(tree)
+        draws.extend(self._parse_table_rows(tree))
 
         deduped = {draw.date: draw for draw in draws}
         results = list(deduped.values())
@@ -36,13 +62,9 @@ class OlgScraper(BaseScraper):
             raise ScrapeError('No draws parsed from OLG page', self.name, 'Check page structure')
         return results
 
-    def _parse_json_blocks(self, soup: BeautifulSoup) -> List[DrawRecord]:
+    def _parse_json_blocks(self, tree) -> List[DrawRecord]:
         records: List[DrawRecord] = []
-        scripts = soup.find_all('script')
-        for script in scripts:
-            content = script.string
-            if not content:
-                continue
+        for content in tree.xpath('//script/text()'):
             if 'drawDate' not in content and 'winningNumbers' not in content:
                 continue
             for payload in self._extract_json_candidates(content):
@@ -51,32 +73,58 @@ class OlgScraper(BaseScraper):
 
     def _extract_json_candidates(self, content: str) -> List[object]:
         candidates: List[object] = []
-        try:
-            if content.strip().startswith('{'):
-                candidates.append(json.loads(content))
-        except json.JSONDecodeError:
-            pass
-        # Try to find JSON objects inside the script
-        for match in re.finditer(r'(\{.*\})', content):
-            snippet = match.group(1)
+        if content.lstrip().startswith('{'):
+            try:
+                # The whole script is one payload; its nested objects are
+                # already part of it, so there is nothing left to sweep.
+                return [json.loads(content)]
+            except json.JSONDecodeError:
+                pass
+        # Try to find JSON objects inside the script: balanced {...} spans,
+        # skipping spans nested in one that already parsed.
+        parsed_until = 0
+        for match in BRACE_PATTERN.finditer(content):
+            start = match.start()
+            if start < parsed_until:
+                continue
+            end = _balanced_end(content, start)
+            if end is None:
+                continue
+            snippet = content[start:end]
+            if 'drawDate' not in snippet:
+                parsed_until = end
+                continue
             try:
                 candidates.append(json.loads(snippet))
             except json.JSONDecodeError:
                 continue
+            parsed_until = end
         return candidates
 
     def _extract_from_json(self, data: object) -> List[DrawRecord]:
+        # Depth-first walk with an explicit stack, so records are not copied
+        # up through every level. A draw mapping can still nest more draws
+        # (e.g. previous results), so its children are walked too; the seen
+        # set keeps any shared container from being walked twice.
         records: List[DrawRecord] = []
-        if isinstance(data, dict):
-            if 'drawDate' in data and ('winningNumbers' in data or 'numbers' in data or 'mainNumbers' in data):
-                record = self._record_from_mapping(data)
-                if record:
-                    records.append(record)
-            for value in data.values():
-                records.extend(self._extract_from_json(value))
-        elif isinstance(data, list):
-            for item in data:
-                records.extend(self._extract_from_json(item))
+        stack = [data]
+        seen: set[int] = set()
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            if isinstance(node, dict):
+                if 'drawDate' in node and ('winningNumbers' in node or 'numbers' in node or 'mainNumbers' in node):
+                    record = self._record_from_mapping(node)
+                    if record:
+                        records.append(record)
+                children = node.values()
+            elif isinstance(node, list):
+                children = node
+            else:
+                continue
+            stack.extend(child for child in reversed(list(children)) if isinstance(child, (dict, list)))
         return records
 
     def _record_from_mapping(self, data: dict) -> DrawRecord | None:
@@ -99,18 +147,26 @@ class OlgScraper(BaseScraper):
             source_url=self.base_url,
         )
 
-    def _parse_table_rows(self, soup: BeautifulSoup) -> List[DrawRecord]:
+    def _parse_table_rows(self, tree) -> List[DrawRecord]:
         records: List[DrawRecord] = []
-        for row in soup.select('table tr'):
-            row_text = row.get_text(' ', strip=True)
+        for row in tree.xpath('//table//tr'):
+            row_text = node_text(row)
             if not row_text:
                 continue
             draw_date = self._extract_date_from_text(row_text)
             if not draw_date:
                 continue
-            numbers = [int(m) for m in NUMBER_PATTERN.findall(row_text)]
-            numbers = [n for n in numbers if 1 <= n <= self.max_number]
-            if len(numbers) < self.main_count + 1:
+            # Main numbers plus the bonus; stop scanning the row once found.
+            wanted = self.main_count + 1
+            max_number = self.max_number
+            numbers = []
+            for match in NUMBER_PATTERN.finditer(row_text):
+                number = int(match.group())
+                if 1 <= number <= max_number:
+                    numbers.append(number)
+                    if len(numbers) == wanted:
+                        break
+            if len(numbers) < wanted:
                 continue
             record = DrawRecord(
                 date=draw_date,
@@ -122,19 +178,15 @@ class OlgScraper(BaseScraper):
         return records
 
     def _extract_date_from_text(self, text: str) -> date | None:
-        for pattern in DATE_PATTERNS:
+        for pattern, formats in DATE_PATTERNS:
             match = pattern.search(text)
             if not match:
                 continue
-            return self._parse_date(match.group(0))
+            return parse_date_formats(match.group(0), formats)
         return None
 
     def _parse_date(self, text: str) -> date | None:
-        try:
-            return date_parser.parse(text, fuzzy=True).date()
-        except (ValueError, TypeError) as exc:
-            logger.debug('Failed to parse date from %s: %s', text, exc)
-            return None
+        return parse_fuzzy_date(text)
 
     def _parse_numbers(self, value: object) -> List[int]:
         if isinstance(value, list):
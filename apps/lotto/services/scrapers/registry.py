@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple
 from .base import DrawRecord, ScrapeError
 from ..game_config import get_game_config
@@ -45,17 +46,24 @@ def fetch_draws(
 
     errors = []
     candidates: List[tuple[str, List[DrawRecord]]] = []
-    for name, scraper in enabled:
-        try:
-            records = scraper.fetch_draws(max_pages=max_pages)
-            candidates.append((name, records))
-        except ScrapeError as exc:
-            errors.append(exc)
+    # Sources are independent and network-bound, so fetch them side by side;
+    # results are collected in configuration order to keep ties stable.
+    with ThreadPoolExecutor(max_workers=len(enabled)) as executor:
+        futures = [
+            (name, executor.submit(scraper.fetch_draws, max_pages=max_pages))
+            for name, scraper in enabled
+        ]
+        for name, future in futures:
+            try:
+                candidates.append((name, future.result()))
+            except ScrapeError as exc:
+                errors.append(exc)
 
     if not candidates:
         last_error = errors[-1]
         raise ScrapeError('All data sources failed', last_error.source, last_error.detail)
 
-    # Choose the source with most draws, then most recent date.
-    candidates.sort(key=lambda item: (len(item[1]), max(r.date for r in item[1])), reverse=True)
-    return candidates[0]
+    # Choose the source with most draws, then most recent date; max() keeps
+    # the first configured source on ties, as the stable sort did.
+    scores = {name: (len(records), max(r.date for r in records)) for name, records in candidates}
+    return max(candidates, key=lambda item: scores[item[0]])
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import logging
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..models import IngestionLog
+from .game_config import get_game_config
+from .ingestion import ingest_draws
+
+logger = logging.getLogger('lotto')
+
+# A single worker acts as the ingestion queue: runs are serialized and never
+# compete with request threads for more than one DB connection. The queue
+# lives in the web process, so a run queued in a worker that restarts is
+# lost; its log stays pending until STALE_PENDING_AFTER has passed and the
+# next enqueue marks it failed. Scheduled ingestion (management command or
+# cron endpoint) runs synchronously and does not depend on it.
+_ingestion_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='lotto-ingest')
+STALE_PENDING_AFTER = timedelta(hours=1)
+
+
+def ingest_draws_task(log_id: int, **options) -> dict | None:
+    try:
+        log = IngestionLog.objects.get(pk=log_id)
+        return ingest_draws(log=log, **options)
+    except Exception as exc:
+        logger.exception('Background ingestion failed for log %s', log_id)
+        IngestionLog.objects.filter(pk=log_id, status='pending').update(status='failed', message=str(exc))
+        return None
+    finally:
+        connection.close()
+
+
+def enqueue_ingest(
+    game: str | None = None,
+    incremental: bool = False,
+    source: str = 'auto',
+) -> IngestionLog:
+    game_key = get_game_config(game).key
+    fail_stale_pending_logs()
+    log = IngestionLog.objects.create(
+        status='pending',
+        game=game_key,
+        source=source,
+        message='Queued',
+    )
+    options = {'game': game_key, 'incremental': incremental, 'source': source}
+    transaction.on_commit(lambda: _ingestion_executor.submit(ingest_draws_task, log.pk, **options))
+    return log
+
+
+def fail_stale_pending_logs() -> int:
+    return IngestionLog.objects.filter(
+        status='pending',
+        run_at__lt=timezone.now() - STALE_PENDING_AFTER,
+    ).update(status='failed', message='Interrupted before completion')
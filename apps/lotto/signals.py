@@ -0,0 +1,20 @@
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Draw
+from .services.cache import bump_draws_version
+from .services.game_config import get_game_config, get_supported_games
+
+
+@receiver(post_save, sender=Draw)
+@receiver(post_delete, sender=Draw)
+def invalidate_draw_caches(sender, instance: Draw, **kwargs) -> None:
+    bump_draws_version(instance.game)
+
+
+@receiver(setting_changed)
+def reset_game_configs(setting: str, **kwargs) -> None:
+    if setting in ('LOTTO_GAMES', 'LOTTO_DEFAULT_GAME'):
+        get_game_config.cache_clear()
+        get_supported_games.cache_clear()
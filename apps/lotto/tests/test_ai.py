@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+
+import numpy as np
+from django.test import TestCase
+
+from apps.lotto.models import AiPredictionSnapshot, Draw
+from apps.lotto.services.ai import FINE_TUNE_EPOCHS, decode_weights, encode_weights, predict_next_draw_probabilities
+from apps.lotto.services.analytics import DrawLite
+
+
+def _draws(count):
+    start = date(2025, 1, 1)
+    return [
+        DrawLite(
+            'max',
+            start + timedelta(days=7 * idx),
+            sorted(((idx + 1) * step) % 47 + 1 for step in (1, 3, 7, 11, 13, 17, 19)),
+            50,
+            f'h{idx}',
+        )
+        for idx in range(count)
+    ]
+
+
+class ModelWeightsTests(TestCase):
+    def test_encode_decode_round_trip(self):
+        rng = np.random.default_rng(0)
+        model = {
+            'w1': rng.uniform(-1, 1, (50, 24)).astype(np.float32),
+            'b1': rng.uniform(-1, 1, 24).astype(np.float32),
+            'w2': rng.uniform(-1, 1, (24, 50)).astype(np.float32),
+            'b2': rng.uniform(-1, 1, 50).astype(np.float32),
+        }
+        decoded = decode_weights(encode_weights(model))
+        for name, value in model.items():
+            assert decoded[name].shape == value.shape
+            assert decoded[name].dtype == np.float32
+            assert np.allclose(decoded[name], value, atol=1e-3)
+
+
+class WarmStartTests(TestCase):
+    def test_warm_start_fine_tunes_from_previous_model(self):
+        draws = _draws(30)
+        cold = predict_next_draw_probabilities(draws[:-1], seed='7')
+        assert cold['meta']['warm_start'] is False
+
+        warm = predict_next_draw_probabilities(draws, seed='7', warm_start=cold)
+        assert warm['meta']['warm_start'] is True
+        assert warm['meta']['epochs'] == FINE_TUNE_EPOCHS
+        assert warm['model']['trained_through'] == draws[-1].date.isoformat()
+        assert len(warm['probabilities']) == 50
+
+    def test_warm_start_ignored_for_other_model_shape(self):
+        draws = _draws(30)
+        previous = predict_next_draw_probabilities(draws[:-1], seed='7', hidden_size=8)
+        result = predict_next_draw_probabilities(draws, seed='7', warm_start=previous)
+        assert result['meta']['warm_start'] is False
+
+
+class AiApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Draw.objects.bulk_create([
+            Draw(
+                game=draw.game,
+                date=draw.date,
+                numbers=draw.numbers,
+                bonus=draw.bonus,
+                source_url='',
+                hash=draw.hash,
+            )
+            for draw in _draws(20)
+        ])
+
+    def test_seeded_response_is_stored_and_repeatable(self):
+        first = self.client.get('/api/ai/?game=max&seed=7&window=0')
+        second = self.client.get('/api/ai/?game=max&seed=7&window=0')
+        assert first.status_code == 200
+        assert first.json() == second.json()
+        assert first.json()['seed'] == '7'
+        assert len(first.json()['top_numbers']) == 7
+        assert AiPredictionSnapshot.objects.filter(game='max', seed='7').count() == 1
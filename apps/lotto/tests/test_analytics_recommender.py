@@ -2,14 +2,17 @@ from datetime import date
 from django.test import TestCase
 
 from apps.lotto.models import Draw
-from apps.lotto.services.analytics import compute_analysis, get_draws
-from apps.lotto.services.recommender import RecommendationEngine, jaccard
+from apps.lotto.services.analytics import DrawLite, _top_k, analysis_cache_params, compute_analysis, get_draws
+from apps.lotto.services.recommender import RecommendationEngine, _top_ticket, jaccard
 
 
 class AnalyticsTests(TestCase):
-    def setUp(self):
-        Draw.objects.create(game='max', date=date(2025, 12, 30), numbers=[1, 2, 3, 4, 5, 6, 7], bonus=8, source_url='', hash='a')
-        Draw.objects.create(game='max', date=date(2025, 12, 27), numbers=[10, 11, 12, 13, 14, 15, 16], bonus=17, source_url='', hash='b')
+    @classmethod
+    def setUpTestData(cls):
+        Draw.objects.bulk_create([
+            Draw(game='max', date=date(2025, 12, 30), numbers=[1, 2, 3, 4, 5, 6, 7], bonus=8, source_url='', hash='a'),
+            Draw(game='max', date=date(2025, 12, 27), numbers=[10, 11, 12, 13, 14, 15, 16], bonus=17, source_url='', hash='b'),
+        ])
 
     def test_compute_analysis_counts(self):
         draws = get_draws(window=2, game='max')
@@ -19,11 +22,45 @@ class AnalyticsTests(TestCase):
         assert freq_map[10] == 1
         assert result.meta['total_draws'] == 2
 
+    def test_compute_analysis_empty_range(self):
+        draws = get_draws(start_date=date(2030, 1, 1), game='max')
+        result = compute_analysis(draws, rolling_window=1)
+        assert result.meta['total_draws'] == 0
+        assert all(item['count'] == 0 for item in result.main_frequency)
+        assert all(item['omission'] == 0 for item in result.omissions)
+        assert result.hot_numbers == []
+        assert result.pair_frequency == []
+        assert result.sum_distribution == []
+        assert result.rolling_series == {'labels': [], 'series': []}
+
+    def test_cache_params_change_when_an_older_draw_is_corrected(self):
+        before = analysis_cache_params('max', 2, 1)
+        draw = Draw.objects.get(game='max', date=date(2025, 12, 27))
+        draw.bonus = 18
+        draw.save()
+        assert analysis_cache_params('max', 2, 1) != before
+
+    def test_hot_numbers_tie_by_lowest_number(self):
+        draws = [
+            DrawLite('max', date(2025, 12, 30), [10, 11, 12, 13, 14, 15, 16], 17, 'x'),
+            DrawLite('max', date(2025, 12, 27), [1, 2, 3, 4, 5, 6, 7], 8, 'y'),
+        ]
+        result = compute_analysis(draws, rolling_window=1)
+        assert [num for num, _ in result.hot_numbers] == [1, 2, 3, 4, 5, 6, 7, 10, 11, 12]
+
+    def test_top_k_breaks_boundary_ties_by_index(self):
+        values = [5, 3, 3, 9, 3, 3, 1]
+        assert _top_k(values, 3).tolist() == [3, 0, 1]
+        assert _top_k(values, 4).tolist() == [3, 0, 1, 2]
+        assert _top_k(values, 0).tolist() == []
+        assert _top_ticket([0.5] * 50, 7) == [1, 2, 3, 4, 5, 6, 7]
+
 
 class RecommendationTests(TestCase):
-    def setUp(self):
-        for idx in range(1, 15):
-            Draw.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        Draw.objects.bulk_create([
+            Draw(
                 game='max',
                 date=date(2025, 1, idx),
                 numbers=[idx, idx + 1, idx + 2, idx + 3, idx + 4, idx + 5, idx + 6],
@@ -31,6 +68,8 @@ class RecommendationTests(TestCase):
                 source_url='',
                 hash=str(idx),
             )
+            for idx in range(1, 15)
+        ])
 
     def test_recommendations_valid(self):
         draws = list(Draw.objects.filter(game='max'))
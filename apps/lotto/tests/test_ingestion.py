@@ -0,0 +1,38 @@
+from datetime import date
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.lotto.models import Draw
+from apps.lotto.services.ingestion import ingest_draws
+from apps.lotto.services.scrapers.base import DrawRecord
+
+
+class IngestionTests(TestCase):
+    def test_draws_inserted_concurrently_are_not_counted(self):
+        records = [
+            DrawRecord(date=date(2025, 12, 30), numbers=[1, 2, 3, 4, 5, 6, 7], bonus=8, source_url=''),
+            DrawRecord(date=date(2025, 12, 26), numbers=[10, 11, 12, 13, 14, 15, 16], bonus=17, source_url=''),
+        ]
+        bulk_create = Draw.objects.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            # Another run stores the first draw between the lookup and the insert.
+            first = objs[0]
+            Draw.objects.create(
+                game=first.game,
+                date=first.date,
+                numbers=first.numbers,
+                bonus=first.bonus,
+                source_url='',
+                hash=first.hash,
+            )
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch('apps.lotto.services.ingestion.fetch_draws', return_value=('olg', records)), \
+                mock.patch.object(Draw.objects, 'bulk_create', side_effect=racing_bulk_create):
+            result = ingest_draws(game='max')
+
+        assert Draw.objects.filter(game='max').count() == 2
+        assert result['draws_added'] == 1
+        assert result['message'] == 'Processed 2 draws, added 1, skipped 0'
@@ -1,8 +1,12 @@
+from datetime import date
 from pathlib import Path
+from unittest import mock
 from django.test import SimpleTestCase
 
+from apps.lotto.services.scrapers.base import DrawRecord, ScrapeError
 from apps.lotto.services.scrapers.lotto8 import Lotto8Scraper
 from apps.lotto.services.scrapers.lotterypost import LotteryPostScraper
+from apps.lotto.services.scrapers.olg import OlgScraper
 
 
 class Lotto8ScraperTests(SimpleTestCase):
@@ -15,6 +19,26 @@ class Lotto8ScraperTests(SimpleTestCase):
         assert records[0].numbers == [5, 21, 32, 38, 43, 44, 45]
         assert records[0].bonus == 49
 
+    def test_probe_steps_past_failed_page(self):
+        scraper = Lotto8Scraper('https://example.com')
+
+        def fake_get(url):
+            if url.endswith('indexpage=4&orderby=new'):
+                raise ScrapeError('Failed to fetch data', scraper.name, 'timeout')
+            return url
+
+        def fake_parse(html):
+            # Pages 1-5 each hold one draw; later pages are empty.
+            page = int(html.split('indexpage=')[1].split('&')[0]) if 'indexpage=' in html else 1
+            if page > 5:
+                return []
+            return [DrawRecord(date=date(2025, 1, page), numbers=[1, 2, 3, 4, 5, 6, 7], bonus=8, source_url=html)]
+
+        with mock.patch.object(scraper, '_get', side_effect=fake_get), \
+                mock.patch.object(scraper, 'parse_draws', side_effect=fake_parse):
+            records = scraper.fetch_draws()
+        assert sorted(record.date.day for record in records) == [1, 2, 3, 5]
+
 
 class LotteryPostScraperTests(SimpleTestCase):
     def test_parse_sample_html(self):
@@ -25,3 +49,33 @@ class LotteryPostScraperTests(SimpleTestCase):
         assert records[0].date.isoformat() == '2009-09-25'
         assert records[0].numbers == [1, 2, 3, 4, 5, 6, 7]
         assert records[0].bonus == 8
+
+    def test_parse_table_rows_and_result_divs(self):
+        html = Path(__file__).parent / 'fixtures' / 'lotterypost_mixed.html'
+        scraper = LotteryPostScraper('https://example.com')
+        records = scraper.parse_draws(html.read_text(encoding='utf-8'))
+        assert sorted(record.date.isoformat() for record in records) == ['2025-12-26', '2025-12-30']
+
+
+class OlgScraperTests(SimpleTestCase):
+    def test_parse_merges_json_and_table(self):
+        html = Path(__file__).parent / 'fixtures' / 'olg_sample.html'
+        scraper = OlgScraper('https://example.com')
+        records = scraper.parse_draws(html.read_text(encoding='utf-8'))
+        assert sorted(record.date.isoformat() for record in records) == ['2025-12-26', '2025-12-30']
+        by_date = {record.date.isoformat(): record for record in records}
+        assert by_date['2025-12-26'].numbers == [10, 11, 12, 13, 14, 15, 16]
+        assert by_date['2025-12-26'].bonus == 17
+
+    def test_extract_nested_draws_from_json(self):
+        scraper = OlgScraper('https://example.com')
+        payload = {
+            'drawDate': '2025-12-30',
+            'winningNumbers': [1, 2, 3, 4, 5, 6, 7],
+            'bonusNumber': 8,
+            'previous': [
+                {'drawDate': '2025-12-26', 'winningNumbers': [10, 11, 12, 13, 14, 15, 16], 'bonusNumber': 17},
+            ],
+        }
+        records = scraper._extract_from_json(payload)
+        assert [record.date.isoformat() for record in records] == ['2025-12-30', '2025-12-26']
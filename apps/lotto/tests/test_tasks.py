@@ -0,0 +1,31 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.lotto.models import IngestionLog
+from apps.lotto.services.tasks import enqueue_ingest, ingest_draws_task
+
+
+class IngestionTaskTests(TestCase):
+    def test_enqueue_creates_pending_log_and_fails_stale_ones(self):
+        stale = IngestionLog.objects.create(game='max', status='pending', source='auto', message='Queued')
+        IngestionLog.objects.filter(pk=stale.pk).update(run_at=timezone.now() - timedelta(hours=2))
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            log = enqueue_ingest(game='max', incremental=True)
+
+        assert log.status == 'pending'
+        assert len(callbacks) == 1
+        stale.refresh_from_db()
+        assert stale.status == 'failed'
+
+    def test_task_marks_log_failed_on_error(self):
+        log = IngestionLog.objects.create(game='max', status='pending', source='auto', message='Queued')
+        with mock.patch('apps.lotto.services.tasks.ingest_draws', side_effect=RuntimeError('boom')), \
+                mock.patch('apps.lotto.services.tasks.connection'):
+            assert ingest_draws_task(log.pk, game='max') is None
+        log.refresh_from_db()
+        assert log.status == 'failed'
+        assert log.message == 'boom'
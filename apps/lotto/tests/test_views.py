@@ -0,0 +1,66 @@
+from datetime import date
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from apps.lotto.models import Draw, IngestionLog
+from apps.lotto.views import _parse_date, _parse_int
+
+
+class StatusApiTests(TestCase):
+    def test_etag_changes_when_latest_log_is_updated(self):
+        log = IngestionLog.objects.create(game='max', status='pending', source='auto', message='Queued')
+        response = self.client.get('/api/status/?game=max')
+        assert response.status_code == 200
+        etag = response['ETag']
+
+        response = self.client.get('/api/status/?game=max', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+        IngestionLog.objects.filter(pk=log.pk).update(status='success', message='Done', draws_added=3)
+        response = self.client.get('/api/status/?game=max', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()['latest_ingestion'] == 'Done'
+
+
+class AnalysisApiTests(TestCase):
+    def test_body_follows_etag_when_draws_change_without_signals(self):
+        # bulk_create sends no signals, like draws written by another process.
+        Draw.objects.bulk_create([
+            Draw(game='max', date=date(2025, 12, 26), numbers=[1, 2, 3, 4, 5, 6, 7], bonus=8, source_url='', hash='a'),
+        ])
+        response = self.client.get('/api/analysis/?game=max')
+        assert response.json()['meta']['total_draws'] == 1
+        etag = response['ETag']
+
+        Draw.objects.bulk_create([
+            Draw(game='max', date=date(2025, 12, 30), numbers=[9, 10, 11, 12, 13, 14, 15], bonus=16, source_url='', hash='b'),
+        ])
+        response = self.client.get('/api/analysis/?game=max', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()['meta']['total_draws'] == 2
+
+
+class QueryParamTests(TestCase):
+    def test_parse_int_falls_back_on_invalid_values(self):
+        assert _parse_int('12', 5) == 12
+        assert _parse_int('abc', 5) == 5
+        assert _parse_int(None, 5) == 5
+        assert _parse_int('9' * 5000, 5) == 5
+
+    def test_parse_date_accepts_only_calendar_dates(self):
+        assert _parse_date('2025-01-06') == date(2025, 1, 6)
+        assert _parse_date('2025-W01-1') is None
+        assert _parse_date('20250106') is None
+        assert _parse_date('2025-02-30') is None
+
+
+@override_settings(CRON_INGEST_TOKEN='secret')
+class CronIngestTests(TestCase):
+    def test_cron_runs_ingestion_in_request(self):
+        result = {'status': 'success', 'draws_added': 2, 'message': 'Processed 2 draws, added 2, skipped 0'}
+        with mock.patch('apps.lotto.views.ingest_draws', return_value=result) as ingest:
+            response = self.client.get('/api/cron/ingest/?game=max', HTTP_X_CRON_TOKEN='secret')
+        assert response.status_code == 200
+        assert response.json()['draws_added'] == 2
+        ingest.assert_called_once_with(incremental=True, source='auto', game='max')
@@ -1,27 +1,56 @@
 from __future__ import annotations
 
-from datetime import datetime
+from dataclasses import asdict
+from datetime import date
+import hashlib
+import hmac
+import json
+import re
 from typing import Optional
 
 from django.conf import settings
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
 from django.utils import translation
 from django.utils.formats import date_format
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import condition, require_http_methods
 
 from .models import Draw, IngestionLog, RecommendationSnapshot, AiPredictionSnapshot
 from .services.ai import predict_next_draw_probabilities
-from .services.analytics import compute_analysis, get_draws
-from .services.cache import AnalysisCache
+from .services.analytics import analysis_cache_params, analysis_json, compute_analysis, draws_signature, get_draws
+from .services.cache import AnalysisCache, get_draws_version
 from .services.game_config import get_game_config, get_supported_games
 from .services.ingestion import ingest_draws
-from .services.recommender import build_recommendations, build_recommendation_snapshot_payload
+from .services.recommender import (
+    build_recommendation_snapshot_payload,
+    build_recommendations,
+    number_mask,
+    snapshot_items,
+)
 
 cache = AnalysisCache()
 
 SUPPORTED_LANGS = {'zh', 'zh-hans', 'en'}
+# API payloads are mostly long number arrays; dropping the default ', ' and
+# ': ' padding trims a noticeable share of the encoded bytes.
+COMPACT_JSON = {'separators': (',', ':')}
+# Columns the home and data pages render for ingestion logs.
+LOG_DISPLAY_FIELDS = ('run_at', 'status', 'source', 'message')
+ISO_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}', re.ASCII)
+DRAW_STATS_TTL = 60
+# _get_lang only ever returns 'en' or 'zh'.
+DISCLAIMERS = {
+    'en': (
+        'Disclaimer: Lottery results are random. Recommendations do not guarantee winnings. '
+        'This site is for statistical learning and visualization only and is not gambling advice.'
+    ),
+    'zh': (
+        '免责声明：彩票结果具有随机性，任何推荐不保证中奖。'
+        '本网站仅用于统计学习与可视化展示，不构成博彩建议。'
+    ),
+}
+
 
 
 def _parse_int(value: Optional[str], default: int) -> int:
@@ -31,39 +60,119 @@ def _parse_int(value: Optional[str], default: int) -> int:
         return default
 
 
-def _parse_date(value: Optional[str]) -> Optional[datetime.date]:
-    if not value:
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    # 3.11's fromisoformat also accepts forms such as 2025-W01-1 and
+    # 20250101; only take the YYYY-MM-DD shape.
+    if not value or not ISO_DATE_PATTERN.fullmatch(value):
         return None
     try:
-        return datetime.strptime(value, '%Y-%m-%d').date()
+        return date.fromisoformat(value)
     except ValueError:
         return None
 
 
+def _api_response(data: dict) -> JsonResponse:
+    return JsonResponse(data, json_dumps_params=COMPACT_JSON)
+
+
 def _get_lang(request) -> str:
     requested = request.GET.get('lang')
     if requested in SUPPORTED_LANGS:
         normalized = 'en' if requested == 'en' else 'zh'
-        request.session['lang'] = normalized
+        # Assigning marks the session modified and forces a store write,
+        # even for the same value, so only write real changes.
+        if request.session.get('lang') != normalized:
+            request.session['lang'] = normalized
 
     lang = request.session.get('lang', 'zh')
     language_code = 'en' if lang == 'en' else 'zh-hans'
-    translation.activate(language_code)
+    if translation.get_language() != language_code:
+        translation.activate(language_code)
     request.LANGUAGE_CODE = language_code
     return lang
 
 
 def _get_game(request) -> str:
+    games = settings.LOTTO_GAMES
+    default_game = settings.LOTTO_DEFAULT_GAME
     requested = request.GET.get('game')
-    if requested in settings.LOTTO_GAMES:
+    if requested in games and request.session.get('game') != requested:
         request.session['game'] = requested
-    game = request.session.get('game', settings.LOTTO_DEFAULT_GAME)
-    if game not in settings.LOTTO_GAMES:
-        game = settings.LOTTO_DEFAULT_GAME
+    game = request.session.get('game', default_game)
+    if game not in games:
+        game = default_game
         request.session['game'] = game
     return game
 
 
+def _draws_signature(request, game_key: str) -> tuple:
+    # The ETag and the cached body must describe the same draws, so both
+    # read this one signature, taken once per request.
+    signatures = request.__dict__.setdefault('_draws_signatures', {})
+    if game_key not in signatures:
+        signatures[game_key] = draws_signature(game_key)
+    return signatures[game_key]
+
+
+def _api_etag(request, *extra) -> str:
+    # API results only change with the game's draws, the query string and
+    # the session language, so clients can revalidate with If-None-Match
+    # and skip the compute and transfer entirely.
+    game_key = _get_game(request)
+    payload = '|'.join(str(part) for part in (
+        game_key,
+        *_draws_signature(request, game_key),
+        request.session.get('lang', 'zh'),
+        request.GET.urlencode(),
+        *extra,
+    ))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _recommendations_etag(request) -> str | None:
+    # Unseeded requests are meant to differ on every call, so they get no
+    # ETag and always run.
+    if not request.GET.get('seed'):
+        return None
+    return _api_etag(request)
+
+
+def _status_etag(request) -> str:
+    # The latest log is updated in place as a run finishes, so its run_at
+    # alone would keep serving the pending state.
+    latest_log = IngestionLog.objects.filter(game=_get_game(request)).values_list(
+        'pk', 'status', 'message', 'draws_added'
+    ).first()
+    return _api_etag(request, *(latest_log or ()))
+
+
+def _draw_stats(game_key: str) -> dict:
+    # Count and latest draw only change with ingestion. The draws version in
+    # the key rotates on ingest in this process; the short TTL bounds how
+    # long other workers (with their own local cache) can lag behind.
+    def compute():
+        draws = Draw.objects.filter(game=game_key)
+        return {
+            'total': draws.count(),
+            'latest': draws.order_by('-date').values('date', 'numbers', 'bonus').first(),
+        }
+
+    params = {'game': game_key, 'version': get_draws_version(game_key)}
+    return cache.get_or_set('draw_stats', params, compute, ttl=DRAW_STATS_TTL)
+
+
+def _get_or_create_snapshot(model, build_payload, **lookup):
+    snapshot = model.objects.filter(**lookup).first()
+    if snapshot is None:
+        # The payload is built only on a miss. ON CONFLICT DO NOTHING makes
+        # a concurrent first hit a no-op instead of an IntegrityError; the
+        # row is read back so both requests return the stored payload (a
+        # warm-started payload can differ between the two computations).
+        model.objects.bulk_create([model(payload=build_payload(), **lookup)], ignore_conflicts=True)
+        snapshot = model.objects.get(**lookup)
+    return snapshot
+
+
 def _get_game_context(request):
     game_key = _get_game(request)
     game = get_game_config(game_key)
@@ -74,14 +183,13 @@ def _get_game_context(request):
 def home(request):
     lang = _get_lang(request)
     game, games = _get_game_context(request)
-    latest_draw = Draw.objects.filter(game=game.key).order_by('-date').first()
-    latest_log = IngestionLog.objects.filter(game=game.key).first()
-    total_draws = Draw.objects.filter(game=game.key).count()
+    stats = _draw_stats(game.key)
+    latest_log = IngestionLog.objects.filter(game=game.key).only(*LOG_DISPLAY_FIELDS).first()
     context = {
-        'latest_draw': latest_draw,
+        'latest_draw': stats['latest'],
         'latest_log': latest_log,
-        'total_draws': total_draws,
-        'disclaimer': _disclaimer_text(lang),
+        'total_draws': stats['total'],
+        'disclaimer': DISCLAIMERS[lang],
         'lang': lang,
         'game': game,
         'games': games,
@@ -95,22 +203,25 @@ def rules(request):
     return render(
         request,
         'lotto/rules.html',
-        {'disclaimer': _disclaimer_text(lang), 'lang': lang, 'game': game, 'games': games},
+        {'disclaimer': DISCLAIMERS[lang], 'lang': lang, 'game': game, 'games': games},
     )
 
 
 def data_status(request):
     lang = _get_lang(request)
     game, games = _get_game_context(request)
-    latest_draw = Draw.objects.filter(game=game.key).order_by('-date').first()
-    logs = IngestionLog.objects.filter(game=game.key)[:10]
-    recent_draws = Draw.objects.filter(game=game.key).order_by('-date')[:15]
+    logs = IngestionLog.objects.filter(game=game.key).only(*LOG_DISPLAY_FIELDS)[:10]
+    # The newest of the recent rows is the latest draw; no separate query.
+    # Plain dicts are enough for the template and skip model construction.
+    recent_draws = list(
+        Draw.objects.filter(game=game.key).order_by('-date').values('date', 'numbers', 'bonus')[:15]
+    )
     context = {
-        'latest_draw': latest_draw,
-        'total_draws': Draw.objects.filter(game=game.key).count(),
+        'latest_draw': recent_draws[0] if recent_draws else None,
+        'total_draws': _draw_stats(game.key)['total'],
         'logs': logs,
         'recent_draws': recent_draws,
-        'disclaimer': _disclaimer_text(lang),
+        'disclaimer': DISCLAIMERS[lang],
         'lang': lang,
         'game': game,
         'games': games,
@@ -124,7 +235,7 @@ def analysis(request):
     window_default = settings.LOTTO_CONFIG['DEFAULT_WINDOW']
     context = {
         'window_default': window_default,
-        'disclaimer': _disclaimer_text(lang),
+        'disclaimer': DISCLAIMERS[lang],
         'lang': lang,
         'game': game,
         'games': games,
@@ -138,7 +249,7 @@ def ai_lab(request):
     window_default = settings.LOTTO_CONFIG['DEFAULT_WINDOW']
     context = {
         'window_default': window_default,
-        'disclaimer': _disclaimer_text(lang),
+        'disclaimer': DISCLAIMERS[lang],
         'lang': lang,
         'game': game,
         'games': games,
@@ -149,12 +260,13 @@ def ai_lab(request):
 def recommendations(request):
     lang = _get_lang(request)
     game, games = _get_game_context(request)
-    window_default = settings.LOTTO_CONFIG['DEFAULT_WINDOW']
-    seed = request.GET.get('seed') or settings.LOTTO_CONFIG.get('RECOMMENDATION_SEED')
+    config = settings.LOTTO_CONFIG
+    window_default = config['DEFAULT_WINDOW']
+    seed = request.GET.get('seed') or config.get('RECOMMENDATION_SEED')
     window = _parse_int(request.GET.get('window'), window_default)
     window_value = window if window > 0 else 0
 
-    latest_two = list(Draw.objects.filter(game=game.key).order_by('-date')[:2])
+    latest_two = list(Draw.objects.filter(game=game.key).only('date', 'numbers', 'bonus').order_by('-date')[:2])
     latest_draw = latest_two[0] if latest_two else None
     previous_draw = latest_two[1] if len(latest_two) > 1 else None
     base_draw = previous_draw or latest_draw
@@ -165,54 +277,33 @@ def recommendations(request):
     snapshot = None
     if base_draw_date:
         seed_value = str(seed or f"auto:{base_draw_date.isoformat()}:{window_value}").strip()
-        snapshot = RecommendationSnapshot.objects.filter(
-            game=game.key,
-            base_draw_date=base_draw_date,
-            window=window_value,
-            seed=seed_value,
-        ).first()
-        if snapshot is None:
+
+        def build_payload():
             draws = get_draws(window=window_value or None, end_date=base_draw_date, game=game.key)
-            payload = build_recommendation_snapshot_payload(
+            return build_recommendation_snapshot_payload(
                 draws,
                 seed=seed_value,
                 main_count=game.main_count,
                 max_number=game.max_number,
             )
-            snapshot = RecommendationSnapshot.objects.create(
-                game=game.key,
-                base_draw_date=base_draw_date,
-                window=window_value,
-                seed=seed_value,
-                payload=payload,
-            )
 
-        for item in snapshot.payload:
-            texts = item.get('texts', {}).get('en' if lang == 'en' else 'zh', {})
-            metrics = item.get('metrics', {})
-            numbers = item.get('numbers', [])
+        snapshot = _get_or_create_snapshot(
+            RecommendationSnapshot,
+            build_payload,
+            game=game.key,
+            base_draw_date=base_draw_date,
+            window=window_value,
+            seed=seed_value,
+        )
+
+        compare_mask = number_mask(compare_draw.numbers) if compare_draw else 0
+        for item in snapshot_items(snapshot.payload, lang):
             match_count = None
             bonus_hit = False
             if compare_draw:
-                match_count = len(set(numbers) & set(compare_draw.numbers))
-                bonus_hit = compare_draw.bonus in numbers
-            recommendations_list.append({
-                'numbers': numbers,
-                'algorithm': item.get('algorithm'),
-                'algorithm_label': texts.get('label', ''),
-                'algorithm_summary': texts.get('summary', ''),
-                'explanation': texts.get('explanation', []),
-                'odd_count': metrics.get('odd_count', 0),
-                'even_count': metrics.get('even_count', 0),
-                'small_count': metrics.get('small_count', 0),
-                'large_count': metrics.get('large_count', 0),
-                'total_sum': metrics.get('total_sum', 0),
-                'hot_count': metrics.get('hot_count', 0),
-                'cold_count': metrics.get('cold_count', 0),
-                'pair_boost': metrics.get('pair_boost', 0),
-                'match_count': match_count,
-                'bonus_hit': bonus_hit,
-            })
+                match_count = (number_mask(item['numbers']) & compare_mask).bit_count()
+                bonus_hit = compare_draw.bonus in item['numbers']
+            recommendations_list.append({**item, 'match_count': match_count, 'bonus_hit': bonus_hit})
 
     context = {
         'recommendations': recommendations_list,
@@ -221,7 +312,7 @@ def recommendations(request):
         'latest_draw': latest_draw,
         'base_draw_date': base_draw_date,
         'compare_draw': compare_draw,
-        'disclaimer': _disclaimer_text(lang),
+        'disclaimer': DISCLAIMERS[lang],
         'lang': lang,
         'game': game,
         'games': games,
@@ -229,21 +320,26 @@ def recommendations(request):
     return render(request, 'lotto/recommendations.html', context)
 
 
+@condition(etag_func=_status_etag)
 def api_status(request):
     game, _ = _get_game_context(request)
-    latest_draw = Draw.objects.filter(game=game.key).order_by('-date').first()
-    latest_log = IngestionLog.objects.filter(game=game.key).first()
-    return JsonResponse({
-        'total_draws': Draw.objects.filter(game=game.key).count(),
-        'latest_draw_date': latest_draw.date.isoformat() if latest_draw else None,
-        'latest_ingestion': latest_log.message if latest_log else None,
+    # Same signature as the ETag rather than _draw_stats, so the body never
+    # lags behind it.
+    total, latest_date, _ = _draws_signature(request, game.key)
+    latest_message = IngestionLog.objects.filter(game=game.key).values_list('message', flat=True).first()
+    return _api_response({
+        'total_draws': total,
+        'latest_draw_date': latest_date,
+        'latest_ingestion': latest_message,
     })
 
 
+@condition(etag_func=_api_etag)
 def api_analysis(request):
     game, _ = _get_game_context(request)
-    window_default = settings.LOTTO_CONFIG['DEFAULT_WINDOW']
-    rolling_default = settings.LOTTO_CONFIG['DEFAULT_ROLLING_WINDOW']
+    config = settings.LOTTO_CONFIG
+    window_default = config['DEFAULT_WINDOW']
+    rolling_default = config['DEFAULT_ROLLING_WINDOW']
 
     window = _parse_int(request.GET.get('window'), window_default)
     if window <= 0:
@@ -252,44 +348,30 @@ def api_analysis(request):
     start_date = _parse_date(request.GET.get('start_date'))
     end_date = _parse_date(request.GET.get('end_date'))
 
-    params = {
-        'game': game.key,
-        'window': window,
-        'rolling': rolling,
-        'start_date': start_date,
-        'end_date': end_date,
-    }
+    params = analysis_cache_params(
+        game.key,
+        window,
+        rolling,
+        start_date=start_date,
+        end_date=end_date,
+        draws=_draws_signature(request, game.key),
+    )
 
     def compute():
         draws = get_draws(window=window, start_date=start_date, end_date=end_date, game=game.key)
-        return compute_analysis(
+        return analysis_json(compute_analysis(
             draws,
             rolling_window=rolling,
             max_number=game.max_number,
             main_count=game.main_count,
             small_threshold=game.small_threshold,
-        )
-
-    analysis_data = cache.get_or_set('analysis', params, compute)
+        ))
 
-    return JsonResponse({
-        'meta': analysis_data.meta,
-        'main_frequency': analysis_data.main_frequency,
-        'bonus_frequency': analysis_data.bonus_frequency,
-        'omissions': analysis_data.omissions,
-        'hot_numbers': analysis_data.hot_numbers,
-        'cold_numbers': analysis_data.cold_numbers,
-        'pair_frequency': analysis_data.pair_frequency,
-        'triplet_frequency': analysis_data.triplet_frequency,
-        'odd_even_distribution': analysis_data.odd_even_distribution,
-        'size_distribution': analysis_data.size_distribution,
-        'sum_distribution': analysis_data.sum_distribution,
-        'span_distribution': analysis_data.span_distribution,
-        'consecutive_ratio': analysis_data.consecutive_ratio,
-        'rolling_series': analysis_data.rolling_series,
-    })
+    body = cache.get_or_set('analysis_json', params, compute)
+    return HttpResponse(body, content_type='application/json')
 
 
+@condition(etag_func=_recommendations_etag)
 def api_recommendations(request):
     lang = _get_lang(request)
     game, _ = _get_game_context(request)
@@ -298,45 +380,45 @@ def api_recommendations(request):
     window = _parse_int(request.GET.get('window'), window_default)
     if window <= 0:
         window = None
-    draws = get_draws(window=window, game=game.key)
-    recommendations_list = build_recommendations(
-        draws,
-        seed=seed,
-        lang=lang,
-        main_count=game.main_count,
-        max_number=game.max_number,
-    )
-
-    payload = []
-    for rec in recommendations_list:
-        payload.append({
-            'numbers': rec.numbers,
-            'odd_count': rec.odd_count,
-            'even_count': rec.even_count,
-            'small_count': rec.small_count,
-            'large_count': rec.large_count,
-            'total_sum': rec.total_sum,
-            'hot_count': rec.hot_count,
-            'cold_count': rec.cold_count,
-            'pair_boost': rec.pair_boost,
-            'explanation': rec.explanation,
-            'algorithm': rec.algorithm,
-            'algorithm_label': rec.algorithm_label,
-            'algorithm_summary': rec.algorithm_summary,
-        })
 
-    return JsonResponse({
-        'seed': seed,
-        'window': window,
-        'recommendations': payload,
-    })
+    def render_body():
+        draws = get_draws(window=window, game=game.key)
+        recommendations_list = build_recommendations(
+            draws,
+            seed=seed,
+            lang=lang,
+            main_count=game.main_count,
+            max_number=game.max_number,
+        )
+        return json.dumps({
+            'seed': seed,
+            'window': window,
+            'recommendations': [asdict(rec) for rec in recommendations_list],
+        }, **COMPACT_JSON)
+
+    if seed:
+        # A seeded run is reproducible, so its encoded body can be reused
+        # until the game's draws change; keyed on the ETag's signature.
+        params = {
+            'game': game.key,
+            'window': window,
+            'seed': seed,
+            'lang': lang,
+            'draws': _draws_signature(request, game.key),
+        }
+        body = cache.get_or_set('recommendations_json', params, render_body)
+    else:
+        body = render_body()
+    return HttpResponse(body, content_type='application/json')
 
 
+@condition(etag_func=_api_etag)
 def api_ai(request):
     lang = _get_lang(request)
     game, _ = _get_game_context(request)
-    window_default = settings.LOTTO_CONFIG['DEFAULT_WINDOW']
-    seed = request.GET.get('seed') or settings.LOTTO_CONFIG.get('RECOMMENDATION_SEED')
+    config = settings.LOTTO_CONFIG
+    window_default = config['DEFAULT_WINDOW']
+    seed = request.GET.get('seed') or config.get('RECOMMENDATION_SEED')
     window = _parse_int(request.GET.get('window'), window_default)
     window_value = window if window > 0 else 0
 
@@ -346,7 +428,7 @@ def api_ai(request):
         'seed': seed,
     }
 
-    latest_two = list(Draw.objects.filter(game=game.key).order_by('-date')[:2])
+    latest_two = list(Draw.objects.filter(game=game.key).only('date', 'numbers', 'bonus').order_by('-date')[:2])
     latest_draw = latest_two[0] if latest_two else None
     previous_draw = latest_two[1] if len(latest_two) > 1 else None
     base_draw = previous_draw or latest_draw
@@ -356,32 +438,49 @@ def api_ai(request):
     result = None
     if base_draw_date:
         seed_value = str(seed or f"auto:ai:{base_draw_date.isoformat()}:{window_value}").strip()
-        snapshot = AiPredictionSnapshot.objects.filter(
-            game=game.key,
-            base_draw_date=base_draw_date,
-            window=window_value,
-            seed=seed_value,
-        ).first()
-        if snapshot is None:
-            draws = get_draws(window=window_value or None, end_date=base_draw_date, game=game.key)
-            payload = predict_next_draw_probabilities(
-                draws,
-                seed=seed_value,
-                max_number=game.max_number,
-                main_count=game.main_count,
+
+        def build_payload():
+            draws = get_draws(
+                window=window_value or None,
+                end_date=base_draw_date,
+                game=game.key,
+                chronological=True,
             )
-            snapshot = AiPredictionSnapshot.objects.create(
+            # Only continue from a model trained under the same seed, so a
+            # seeded request stays reproducible; unseeded snapshots share the
+            # auto seed lineage.
+            lineage = {'seed': seed_value} if seed else {'seed__startswith': 'auto:ai:'}
+            previous = AiPredictionSnapshot.objects.filter(
                 game=game.key,
-                base_draw_date=base_draw_date,
                 window=window_value,
+                base_draw_date__lt=base_draw_date,
+                **lineage,
+            ).order_by('-base_draw_date', '-created_at').first()
+            return predict_next_draw_probabilities(
+                draws,
                 seed=seed_value,
-                payload=payload,
+                max_number=game.max_number,
+                main_count=game.main_count,
+                warm_start=previous.payload if previous else None,
             )
+
+        snapshot = _get_or_create_snapshot(
+            AiPredictionSnapshot,
+            build_payload,
+            game=game.key,
+            base_draw_date=base_draw_date,
+            window=window_value,
+            seed=seed_value,
+        )
         result = snapshot.payload
 
     if result is None:
         def compute():
-            draws = get_draws(window=window_value or None, game=game.key)
+            draws = get_draws(
+                window=window_value or None,
+                game=game.key,
+                chronological=True,
+            )
             return predict_next_draw_probabilities(
                 draws,
                 seed=seed,
@@ -394,10 +493,11 @@ def api_ai(request):
     match_count = None
     bonus_hit = False
     if compare_draw:
-        match_count = len(set(result.get('top_numbers', [])) & set(compare_draw.numbers))
-        bonus_hit = compare_draw.bonus in set(result.get('top_numbers', []))
+        top_numbers = set(result.get('top_numbers', []))
+        match_count = len(top_numbers.intersection(compare_draw.numbers))
+        bonus_hit = compare_draw.bonus in top_numbers
 
-    return JsonResponse({
+    return _api_response({
         'window': window_value,
         'seed': seed,
         'experimental': True,
@@ -418,22 +518,27 @@ def api_ai(request):
 @require_http_methods(['GET', 'POST'])
 def cron_ingest(request):
     expected_token = settings.CRON_INGEST_TOKEN
-    auth_header = request.headers.get('Authorization', '')
-    bearer_token = auth_header.replace('Bearer ', '').replace('Token ', '').strip() if auth_header else ''
-    token = (
-        request.headers.get('X-CRON-TOKEN')
-        or request.headers.get('X-CRON-SECRET')
-        or bearer_token
-        or request.GET.get('token')
-        or request.POST.get('token')
+    auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+    scheme, _, credentials = auth_header.partition(' ')
+    bearer_token = credentials.strip() if scheme in ('Bearer', 'Token') else auth_header.strip()
+    meta = request.META
+    candidates = (
+        meta.get('HTTP_X_CRON_TOKEN'),
+        meta.get('HTTP_X_CRON_SECRET'),
+        bearer_token,
+        request.GET.get('token'),
+        request.POST.get('token'),
     )
+    token = next(filter(None, candidates), '')
     if not expected_token:
         return JsonResponse({'error': 'CRON_INGEST_TOKEN not configured'}, status=500)
-    if token != expected_token:
+    # Constant-time comparison so response timing does not leak the token.
+    if not hmac.compare_digest(token.encode('utf-8'), expected_token.encode('utf-8')):
         return JsonResponse({'error': 'Unauthorized'}, status=403)
 
+    games = settings.LOTTO_GAMES
     game_param = request.GET.get('game') or request.POST.get('game')
-    if game_param and game_param != 'all' and game_param not in settings.LOTTO_GAMES:
+    if game_param and game_param != 'all' and game_param not in games:
         return JsonResponse({'error': 'Unsupported game', 'game': game_param}, status=400)
 
     if game_param and game_param != 'all':
@@ -446,14 +551,14 @@ def cron_ingest(request):
             total_added = 0
             messages = []
             errors = []
-            for game_key in settings.LOTTO_GAMES.keys():
+            for game_key in games.keys():
                 try:
                     result = ingest_draws(incremental=True, source=source, game=game_key)
                     total_added += result['draws_added']
                     messages.append(f"{game_key}: {result['message']}")
                 except Exception as exc:
                     errors.append(f"{game_key}: {exc}")
-            if errors and len(errors) == len(settings.LOTTO_GAMES):
+            if errors and len(errors) == len(games):
                 return JsonResponse({'error': 'All games failed', 'details': errors}, status=500)
             return JsonResponse({
                 'status': 'partial' if errors else 'success',
@@ -472,14 +577,3 @@ def cron_ingest(request):
         'message': result['message'],
     })
 
-
-def _disclaimer_text(lang: str) -> str:
-    if lang == 'en':
-        return (
-            'Disclaimer: Lottery results are random. Recommendations do not guarantee winnings. '
-            'This site is for statistical learning and visualization only and is not gambling advice.'
-        )
-    return (
-        '免责声明：彩票结果具有随机性，任何推荐不保证中奖。'
-        '本网站仅用于统计学习与可视化展示，不构成博彩建议。'
-    )
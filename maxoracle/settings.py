@@ -21,6 +21,9 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    # Static files come precompressed from WhiteNoise; this covers the JSON
+    # API and rendered pages.
+    'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,7 +58,10 @@ ASGI_APPLICATION = 'maxoracle.asgi.application'
 DATABASES = {
     'default': dj_database_url.config(
         default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
-        conn_max_age=600,
+        # Keep worker connections open indefinitely; the health check
+        # replaces a dropped connection at the start of the next request.
+        conn_max_age=None,
+        conn_health_checks=True,
     )
 }
 
@@ -92,8 +98,19 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CRON_INGEST_TOKEN = os.getenv('CRON_INGEST_TOKEN')
 
+# Sessions only carry the language/game toggles (plus admin login), so keep
+# them in a signed cookie instead of a django_session row per visitor.
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+
+# Shared Redis cache when REDIS_URL is set, so gunicorn workers reuse each
+# other's analyses and see the same draws version; per-process otherwise.
+REDIS_URL = os.getenv('REDIS_URL')
 CACHES = {
     'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'TIMEOUT': 60 * 15,
+    } if REDIS_URL else {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'lottomax-analysis',
         'TIMEOUT': 60 * 15,
@@ -155,6 +172,8 @@ LOTTO_CONFIG = {
     'RECOMMENDATION_COUNT': int(os.getenv('LOTTO_RECOMMENDATION_COUNT', '5')),
     'RECOMMENDATION_SEED': os.getenv('LOTTO_RECOMMENDATION_SEED'),
     'MIN_REQUIRED_DRAWS': int(os.getenv('LOTTO_MIN_DRAWS', '1000')),
+    # 'sha256' keeps fingerprints compatible with existing rows; 'blake2b' is cheaper.
+    'DRAW_HASH': os.getenv('LOTTO_DRAW_HASH', 'sha256'),
 }
 
 LOGGING = {